@@ -1,34 +1,286 @@
 # aco.py
+import multiprocessing
+import os
+import time
+from multiprocessing import shared_memory
+
 import numpy as np
 import random
 
+import instrument
+from graph import CSRGraph, dense_distance
+
 
 class AntColony:
-    def __init__(self, graph, n_ants, n_iterations, decay, alpha=1, beta=2):
+    def __init__(self, graph, n_ants, n_iterations, decay, alpha=1, beta=2,
+                 engine="python", seed=None, pheromone=None, dtype=np.float64,
+                 candidates=None, deposit="all", elite_weight=None, rank_size=6,
+                 patience=None, min_branching=None, min_entropy=None, time_limit=None,
+                 distance=None, variant="as", q0=None, local_decay=0.1, p_best=0.05,
+                 restart_after=None):
         """
-        :param graph: Graph NetworkX dengan bobot edge
+        :param graph: Graph NetworkX dengan bobot edge, atau CSRGraph
+            (hanya untuk engine "numpy")
         :param n_ants: jumlah semut
         :param n_iterations: jumlah iterasi
         :param decay: faktor penguapan feromon
         :param alpha: pengaruh feromon
         :param beta: pengaruh jarak
+        :param engine: "python" (satu semut per langkah, implementasi awal)
+            atau "numpy" (semua semut bergerak serentak di atas matriks padat)
+        :param seed: seed RNG untuk engine "numpy"
+        :param pheromone: feromon awal (warm start), mis. self.pheromone dari
+            koloni sebelumnya atau hasil load_pheromone; None = np.ones
+        :param dtype: tipe data feromon dan heuristik (mis. np.float32 untuk
+            menghemat memori)
+        :param candidates: jika diisi k, tiap node hanya menyimpan k tetangga
+            terdekat sebagai kandidat langkah (feromon berukuran (n, k));
+            hanya untuk engine "numpy"
+        :param deposit: strategi deposit feromon: "all" (setiap semut 1/cost),
+            "elitist" (ditambah elite_weight/cost jalur terbaik sejauh ini)
+            atau "rank" (rank_size-1 semut terbaik dengan bobot menurun,
+            ditambah jalur terbaik sejauh ini berbobot rank_size)
+        :param elite_weight: bobot jalur terbaik untuk "elitist"; None = n_ants
+        :param rank_size: jumlah peringkat w untuk "rank"
+        :param patience: berhenti jika best cost tidak membaik selama
+            `patience` iterasi berturut-turut
+        :param min_branching: berhenti jika rata-rata lambda-branching factor
+            (lambda = 0.05) feromon turun hingga nilai ini (mis. 1.1)
+        :param min_entropy: berhenti jika rata-rata entropi feromon per node
+            (dinormalisasi ke 0..1) turun hingga nilai ini
+        :param time_limit: batas waktu run dalam detik
+        :param distance: matriks jarak padat yang sudah dihitung untuk graph
+            NetworkX (inf = tidak ada edge), mis. dari cache.distance_matrix;
+            None = dihitung dari graph
+        :param variant: "as" (Ant System, deposit sesuai `deposit`), "mmas"
+            (Max-Min Ant System: hanya semut terbaik iterasi yang deposit,
+            feromon dibatasi [tau_min, tau_max], restart opsional) atau "acs"
+            (Ant Colony System: aturan q0, local update, global update hanya
+            pada jalur terbaik sejauh ini, heuristik diarahkan ke tujuan
+            lewat estimasi sisa cost, lihat _set_goal); "mmas"/"acs" hanya
+            engine "numpy"
+        :param q0: peluang eksploitasi (langsung memilih edge dengan choice
+            info terbesar); None = 0.9 untuk "acs", 0 untuk lainnya
+        :param local_decay: xi pada local update ACS,
+            tau = (1 - xi) * tau + xi * tau0 untuk tiap edge yang baru dilalui
+        :param p_best: peluang MMAS membangun ulang jalur terbaik saat
+            konvergen, menentukan tau_min
+        :param restart_after: MMAS: feromon di-reset ke tau_max jika best
+            cost tidak membaik selama sekian iterasi
         """
+        if engine not in ("python", "numpy"):
+            raise ValueError(f"engine tidak dikenal: {engine!r}")
+        if isinstance(graph, CSRGraph) and engine != "numpy":
+            raise ValueError("graph CSR hanya didukung engine 'numpy'")
+        if candidates is not None and engine != "numpy":
+            raise ValueError("candidate list hanya didukung engine 'numpy'")
+        if deposit not in ("all", "elitist", "rank"):
+            raise ValueError(f"strategi deposit tidak dikenal: {deposit!r}")
+        if variant not in ("as", "mmas", "acs"):
+            raise ValueError(f"varian ACO tidak dikenal: {variant!r}")
+        if variant != "as" and engine != "numpy":
+            raise ValueError(f"varian {variant!r} hanya didukung engine 'numpy'")
+
         self.graph = graph
         self.n_ants = n_ants
         self.n_iterations = n_iterations
         self.decay = decay
         self.alpha = alpha
         self.beta = beta
+        self.engine = engine
+        self.rng = np.random.default_rng(seed)
+        self.dtype = np.dtype(dtype)
+        self.candidates = candidates
+        self.deposit = deposit
+        self.elite_weight = n_ants if elite_weight is None else elite_weight
+        self.rank_size = rank_size
+        self._elite = None  # (rows, cols, cost) jalur terbaik sejauh ini
+        self._goal = None       # ACS: tujuan heuristik saat ini
+        self._remaining = None  # ACS: estimasi sisa cost tiap node ke tujuan
+
+        # MMAS / ACS. tau0 (feromon awal ACS / tau_max awal MMAS) dan batas
+        # MMAS diestimasi dari jalur greedy saat run pertama (_init_variant).
+        self.variant = variant
+        self.q0 = (0.9 if variant == "acs" else 0.0) if q0 is None else q0
+        self.local_decay = local_decay
+        self.p_best = p_best
+        self.restart_after = restart_after
+        self.tau0 = None
+        self.tau_min = None
+        self.tau_max = None
+        self._best_cost = np.inf  # cost terbaik untuk batas MMAS
+        self._fresh = pheromone is None  # feromon belum diisi (bukan warm start)
+        self.restarts = 0
+        self._stale = 0
+
+        # kriteria berhenti dan jejak konvergensi run terakhir
+        self.patience = patience
+        self.min_branching = min_branching
+        self.min_entropy = min_entropy
+        self.time_limit = time_limit
+        self.convergence = {"best": [], "mean": []}
+        self.stop_reason = None
+
+        # penguapan lazy: feromon sebenarnya = pheromone * pheromone_scale.
+        # Di luar run() skala selalu 1; batas bawah dijaga agar pheromone**alpha
+        # tidak overflow pada dtype yang dipakai.
+        self.pheromone_scale = 1.0
+        self._min_scale = np.finfo(self.dtype).tiny ** (1.0 / (2 * max(alpha, 1)))
+
+        # snapshot graph untuk engine "numpy" (dibuat saat run pertama)
+        self.distance = distance
+        self.heuristic = None
+        self.neighbors = None  # tabel tetangga (n, D) untuk graph CSR / candidate list
+        self.choice_info = None  # pheromone**alpha * heuristic, sekali per iterasi
+
+        if isinstance(graph, CSRGraph):
+            # feromon[i, k] milik edge i -> neighbors[i, k]
+            self.num_nodes = len(graph)
+            self.neighbors, self.distance = graph.to_padded(max_degree=candidates)
+            self.pheromone = np.ones(self.neighbors.shape, dtype=self.dtype)
+        elif candidates is not None:
+            self.num_nodes = len(graph.nodes)
+            self.neighbors, self.distance = self._candidate_table(candidates)
+            self.pheromone = np.ones(self.neighbors.shape, dtype=self.dtype)
+        else:
+            self.num_nodes = len(graph.nodes)
+            self.pheromone = np.ones((self.num_nodes, self.num_nodes), dtype=self.dtype)  # matriks feromon
+
+        if pheromone is not None:
+            self._set_pheromone(pheromone)
+        self.dead = np.zeros(self.num_nodes, dtype=bool)  # node yang tidak boleh dilewati
+
+    def _candidate_table(self, k):
+        """k tetangga terdekat tiap node dari graph NetworkX, urut dari yang terdekat."""
+        n = self.num_nodes
+        distance = self.distance
+        if distance is None:
+            distance = dense_distance(self.graph, n)
+        k = max(1, min(k, n - 1))
+        nbr = np.argpartition(distance, k - 1, axis=1)[:, :k]
+        dist = np.take_along_axis(distance, nbr, axis=1)
+        order = np.argsort(dist, axis=1)
+        nbr = np.take_along_axis(nbr, order, axis=1)
+        dist = np.take_along_axis(dist, order, axis=1)
+        nbr[~np.isfinite(dist)] = -1
+        return nbr, dist
 
-        n_nodes = len(graph.nodes)
-        self.pheromone = np.ones((n_nodes, n_nodes))  # matriks feromon
+    def _set_pheromone(self, pheromone):
+        pheromone = np.asarray(pheromone, dtype=self.dtype)
+        if pheromone.shape != self.pheromone.shape:
+            raise ValueError(f"bentuk feromon {pheromone.shape} tidak cocok, "
+                             f"seharusnya {self.pheromone.shape}")
+        self.pheromone = pheromone.copy()
+
+    def save_pheromone(self, path):
+        """Simpan state feromon ke file .npz agar bisa dipakai ulang."""
+        np.savez(path, pheromone=self.pheromone, dead=self.dead,
+                 neighbors=self.neighbors if self.neighbors is not None else np.empty(0))
+
+    def load_pheromone(self, path):
+        """Muat state feromon dari save_pheromone (warm start)."""
+        with np.load(path) as data:
+            if self.neighbors is not None and not np.array_equal(data["neighbors"], self.neighbors):
+                raise ValueError("tabel tetangga pada file tidak cocok dengan graph")
+            self._set_pheromone(data["pheromone"])
+            self.dead = data["dead"].copy()
+        self._fresh = False
+
+    def update_weights(self, edges, reset_pheromone=False):
+        """
+        Perbarui bobot sebagian edge tanpa membangun ulang snapshot. Hanya
+        snapshot koloni (jarak/heuristik) yang berubah; graph masukan tidak
+        disentuh karena bisa dipakai bersama (mis. entri cache).
+        :param edges: iterable (u, v, weight), dict {(u, v): weight} atau
+            array (m, 3), mis. hasil EdgeCostModel.update
+        :param reset_pheromone: kembalikan feromon edge tersebut ke 1
+        """
+        if isinstance(edges, np.ndarray):
+            if not len(edges):
+                return
+            u, v, w = edges.T
+        else:
+            if isinstance(edges, dict):
+                edges = [(u, v, w) for (u, v), w in edges.items()]
+            edges = list(edges)
+            if not edges:
+                return
+            u, v, w = (np.asarray(x) for x in zip(*edges))
+        u, v, w = u.astype(np.intp), v.astype(np.intp), w.astype(float)
+
+        if self.distance is None:
+            self._snapshot()
+
+        # graph tak berarah: perbarui kedua arah
+        rows = np.concatenate([u, v])
+        nxt = np.concatenate([v, u])
+        w = np.concatenate([w, w])
+        if self.neighbors is None:
+            cols = nxt
+        else:
+            match = self.neighbors[rows] == nxt[:, None]
+            found = match.any(axis=1)
+            if not found.all():
+                if self.candidates is None:
+                    raise ValueError("edge tidak ada di graph")
+                # edge di luar candidate list tidak disimpan, abaikan
+                rows, nxt, w, match = rows[found], nxt[found], w[found], match[found]
+            cols = np.argmax(match, axis=1)
+
+        if self.distance is not None:
+            if not self.distance.flags.writeable:
+                self.distance = self.distance.copy()  # matriks bersama (cache)
+            self.distance[rows, cols] = w
+        if self.heuristic is not None:
+            self.heuristic[rows, cols] = self._heuristic(w, nxt)
+        if reset_pheromone:
+            self.pheromone[rows, cols] = 1.0 if self.tau0 is None else self.tau0
+        self.choice_info = None
+
+    def remove_nodes(self, nodes, radius=None, smoothing=0.2):
+        """
+        Tandai node (mis. node mati) agar tidak lagi dilewati semut. Feromon
+        node di sekitarnya digeser ke nilai maksimum barisnya dengan bobot
+        max(0, 1 - jarak / radius) (hanya tetangga langsung node mati), dan
+        seluruh feromon dihaluskan sedikit ke arah maksimum barisnya. Urutan
+        jejak lama tetap tersimpan (warm start), tetapi semut tidak terjebak
+        jejak yang kini buntu, juga pada graph lengkap.
+        :param radius: jarak reset lokal; None = median panjang edge node mati
+        :param smoothing: porsi penghalusan global (0 = tanpa, 1 = diratakan)
+        """
+        nodes = np.asarray(list(nodes), dtype=np.intp)
+        self.dead[nodes] = True
+        if self.distance is None:
+            self._snapshot()
+
+        # jarak tiap node ke node mati terdekat (lewat edge langsung)
+        near = np.full(self.num_nodes, np.inf)
+        for node in nodes:
+            d = self.distance[node]
+            if self.neighbors is None:
+                np.minimum(near, d, out=near)
+            else:
+                nbr = self.neighbors[node]
+                np.minimum.at(near, nbr[nbr >= 0], d[nbr >= 0])
+        if radius is None:
+            edges = self.distance[nodes]
+            edges = edges[np.isfinite(edges)]
+            radius = float(np.median(edges)) if len(edges) else 0.0
+        weight = np.clip(1.0 - near / radius, 0.0, 1.0) if radius > 0 else np.zeros(self.num_nodes)
+        weight[nodes] = 0.0
+        weight = weight + smoothing * (1.0 - weight)
+
+        valid = np.isfinite(self.distance)
+        peak = np.where(valid, self.pheromone, -np.inf).max(axis=1, initial=-np.inf)
+        peak = np.where(np.isfinite(peak), peak, 0.0)
+        lifted = self.pheromone + weight[:, None] * (peak[:, None] - self.pheromone)
+        self.pheromone[...] = np.where(valid, lifted, self.pheromone)
+        self.choice_info = None
 
     def _probability(self, current, unvisited):
-        pheromone = self.pheromone[current, unvisited] ** self.alpha
-        distance = np.array([self.graph[current][j]['weight'] for j in unvisited])
-        distance[distance == 0] = 1e-6  # cegah div 0
-        heuristic = (1.0 / distance) ** self.beta
-        prob = pheromone * heuristic
+        if self.choice_info is None:
+            self._update_choice_info()
+        prob = self.choice_info[current, unvisited].astype(float)
         prob_sum = prob.sum()
         if prob_sum == 0:
             return np.ones_like(prob) / len(prob)
@@ -36,42 +288,853 @@ class AntColony:
 
     def _build_path(self, start, end):
         path = [start]
-        visited = set(path)
+        visited = set(path) | set(np.flatnonzero(self.dead).tolist())
         current = start
+        evals = 0
         while current != end:
             unvisited = [n for n in self.graph.nodes if n not in visited]
             if not unvisited:
                 break
             probs = self._probability(current, unvisited)
+            evals += len(unvisited)
             next_node = np.random.choice(unvisited, p=probs)
             path.append(next_node)
             visited.add(next_node)
             current = next_node
+
+        instrument.count("ants_built")
+        instrument.count("steps", len(path) - 1)
+        instrument.count("prob_evals", evals)
         return path
 
-    def run(self, start, end):
+    def _snapshot(self):
+        """Salin graph sekali ke matriks jarak dan heuristik padat."""
+        if self.neighbors is None and self.distance is None:
+            n = self.pheromone.shape[0]
+            self.distance = dense_distance(self.graph, n)
+        self.heuristic = self._heuristic(self.distance, self._targets())
+
+    def _targets(self):
+        """Node tujuan tiap entri matriks jarak/feromon (-1 = slot kosong)."""
+        if self.neighbors is None:
+            return np.broadcast_to(np.arange(self.num_nodes), self.distance.shape)
+        return self.neighbors
+
+    def _heuristic(self, weight, target):
+        """
+        Heuristik (1 / cost)**beta untuk edge berbobot weight menuju node
+        target. Jika _remaining diisi (ACS), estimasi sisa cost target ke
+        tujuan ikut dijumlahkan sehingga heuristik mengarah ke tujuan.
+        """
+        if self._remaining is not None:
+            weight = weight + self._remaining[np.maximum(target, 0)]
+        edge = np.isfinite(weight)
+        safe = np.where(weight == 0, 1e-6, weight)  # cegah div 0
+        heuristic = np.zeros(np.shape(weight), dtype=self.dtype)
+        heuristic[edge] = (1.0 / safe[edge]) ** self.beta
+        return heuristic
+
+    def _set_goal(self, end):
+        """
+        ACS: estimasi sisa cost tiap node ke `end` = jumlah hop (BFS) x
+        rata-rata panjang edge, lalu hitung ulang heuristik. Dengan heuristik
+        1/jarak saja aturan q0 mengeksploitasi edge terpendek yang tidak
+        mengarah ke tujuan, sehingga ACS kalah dari AS pada routing s-t.
+        """
+        if self.heuristic is None:
+            self._snapshot()
+        hops = np.full(self.num_nodes, np.inf)
+        hops[end] = 0
+        frontier = np.zeros(self.num_nodes, dtype=bool)
+        frontier[end] = True
+        k = 0
+        while frontier.any():
+            k += 1
+            if self.neighbors is None:
+                reach = np.isfinite(self.distance[frontier]).any(axis=0)
+            else:
+                nbr = self.neighbors[frontier]
+                reach = np.zeros(self.num_nodes, dtype=bool)
+                reach[nbr[nbr >= 0]] = True
+            frontier = reach & np.isinf(hops)
+            hops[frontier] = k
+
+        edges = self.distance[np.isfinite(self.distance)]
+        self._remaining = hops * (edges.mean() if len(edges) else 1.0)
+        self._goal = end
+        self.heuristic = self._heuristic(self.distance, self._targets())
+        self.choice_info = None
+
+    def _update_choice_info(self):
+        """
+        Hitung choice_info = pheromone**alpha * heuristic untuk seluruh
+        matriks sekali (per iterasi), bukan per langkah semut. Skala penguapan
+        lazy berlaku sama untuk semua edge sehingga tidak perlu disertakan.
+        """
+        if self.heuristic is None:
+            self._snapshot()
+        choice = self.choice_info
+        if choice is None or choice.shape != self.pheromone.shape or choice.dtype != self.dtype:
+            choice = self.choice_info = np.empty(self.pheromone.shape, dtype=self.dtype)
+        np.power(self.pheromone, self.alpha, out=choice)
+        choice *= self.heuristic
+        return choice
+
+    def _init_variant(self, start, end):
+        """
+        MMAS/ACS: estimasi tau0 dari cost jalur greedy (seperti nearest
+        neighbour pada TSP) dan isi feromon awal jika bukan warm start.
+        ACS: tau0 = 1 / (n * C); MMAS: tau0 = tau_max = 1 / (decay * C).
+        ACS juga mengarahkan heuristik ke `end` (_set_goal).
+        """
+        if self.variant == "acs" and np.ndim(end) == 0 and self._goal != end:
+            self._set_goal(int(end))
+        if self.variant == "as" or self.tau0 is not None:
+            return
+        if self.heuristic is None:
+            self._snapshot()
+        paths, slots, lengths, costs = self._build_paths(start, end, q0=1.0)
+        ok = np.isfinite(costs)
+        if ok.any():
+            i = np.flatnonzero(ok)[np.argmin(costs[ok])]
+            cost, steps = float(costs[i]), int(lengths[i]) - 1
+        else:
+            # greedy buntu: batas atas cost jalur sederhana
+            cost = float(self.distance[np.isfinite(self.distance)].max()) * self.num_nodes
+            steps = self.num_nodes - 1
+
+        if self.variant == "acs":
+            self.tau0 = 1.0 / (self.num_nodes * cost)
+        else:
+            self._set_bounds(cost, steps)
+            self.tau0 = self.tau_max
+        if self._fresh:
+            self.pheromone.fill(self.tau0 / self.pheromone_scale)
+            self._fresh = False
+
+    def _set_bounds(self, best_cost, steps):
+        """
+        Batas feromon MMAS (Stützle & Hoos): tau_max = 1 / (decay * best_cost),
+        tau_min dari p_best dengan `steps` keputusan per jalur dan rata-rata
+        separuh derajat node sebagai jumlah pilihan per keputusan.
+        """
+        self._best_cost = best_cost
+        self.tau_max = 1.0 / (self.decay * best_cost)
+        if self.neighbors is None:
+            degree = np.isfinite(self.distance).sum(axis=1).mean()
+        else:
+            degree = (self.neighbors >= 0).sum(axis=1).mean()
+        avg = max(degree / 2, 2.0)
+        root = self.p_best ** (1.0 / max(steps, 1))
+        self.tau_min = min(self.tau_max * (1 - root) / ((avg - 1) * root), self.tau_max)
+
+    def _bound(self):
+        """MMAS: jepit feromon (nilai sebenarnya, dengan skala lazy) ke [tau_min, tau_max]."""
+        if self.variant == "mmas" and self.tau_max is not None:
+            scale = self.pheromone_scale
+            np.clip(self.pheromone, self.tau_min / scale, self.tau_max / scale, out=self.pheromone)
+
+    def _restart_if_stagnant(self, improved):
+        """MMAS: reset feromon ke tau_max jika best cost tidak membaik restart_after iterasi."""
+        if self.variant != "mmas" or self.restart_after is None or self.tau_max is None:
+            return
+        self._stale = 0 if improved else self._stale + 1
+        if self._stale >= self.restart_after:
+            self.pheromone.fill(self.tau_max / self.pheromone_scale)
+            self._stale = 0
+            self.restarts += 1
+            instrument.count("restarts")
+
+    def _evaporate(self):
+        """Penguapan global lazy; ACS hanya menguapkan edge jalur terbaik (_reinforce)."""
+        if self.variant != "acs":
+            self.pheromone_scale *= (1 - self.decay)
+
+    def _reinforce(self, rows, cols, cost, weight=1.0):
+        """
+        Deposit weight / cost pada satu jalur. ACS (global update):
+        tau = (1 - decay) * tau + decay / cost, hanya pada edge jalur tersebut.
+        """
+        scale = self.pheromone_scale
+        if self.variant == "acs":
+            self.pheromone[rows, cols] = ((1 - self.decay) * self.pheromone[rows, cols]
+                                          + self.decay / cost / scale)
+        else:
+            self.pheromone[rows, cols] += weight / cost / scale
+
+    def _build_paths(self, start, end, q0=None):
+        """
+        Bangun jalur semua semut sekaligus dengan roulette-wheel per baris
+        di atas choice_info (dihitung sekali di awal). Dengan peluang q0
+        semut langsung memilih edge terbaik (ACS); pada ACS edge yang dilalui
+        langsung mendapat local update (serentak per langkah, semut pada
+        langkah yang sama tidak saling melihat).
+        :param start: node awal (sama untuk semua semut) atau array node awal
+            per semut
+        :param end: node tujuan, atau mask bool (n,) berisi node-node tujuan
+            (semut berhenti di tujuan pertama yang dicapai)
+        :param q0: peluang eksploitasi; None = self.q0, 1 = greedy penuh
+        :return: (paths, slots, lengths, costs); paths berukuran
+            (n_ants, langkah) dan diisi -1 setelah akhir jalur, slots adalah
+            kolom feromon tiap edge yang dilalui. Semut yang buntu sebelum
+            mencapai end mendapat cost inf.
+        """
+        n = self.num_nodes
+        q0 = self.q0 if q0 is None else q0
+        local = self.variant == "acs" and self.tau0 is not None
+        choice = self._update_choice_info()
+        current = np.array(start, dtype=np.intp, ndmin=1)
+        if np.ndim(start) == 0:
+            current = np.full(self.n_ants, start, dtype=np.intp)
+        n_ants = len(current)
+        if np.ndim(end) == 0:
+            target = np.zeros(n, dtype=bool)
+            target[end] = True
+        else:
+            target = np.asarray(end, dtype=bool)
+
+        costs = np.zeros(n_ants)
+        visited = np.zeros((n_ants, n), dtype=bool)
+        visited[:, self.dead] = True
+        visited[np.arange(n_ants), current] = True
+        # dengan banyak tujuan, semut yang berangkat dari node tujuan tetap
+        # mencari tujuan lain
+        active = ~target[current] if np.ndim(end) == 0 else np.ones(n_ants, dtype=bool)
+        steps = [current.copy()]
+        slots = []
+        evals = 0
+
+        while active.any():
+            idx = np.flatnonzero(active)
+            cur = current[idx]
+
+            if self.neighbors is None:
+                allowed = ~visited[idx] & np.isfinite(self.distance[cur])
+            else:
+                cand = self.neighbors[cur]
+                allowed = (cand >= 0) & ~visited[idx[:, None], cand]
+            weights = choice[cur]
+            weights[~allowed] = 0.0
+            evals += allowed.size
+
+            # feromon habis (underflow) -> pilih seragam di antara kandidat
+            empty = weights.sum(axis=1) == 0
+            if empty.any():
+                weights[empty] = allowed[empty]
+
+            cum = np.cumsum(weights, axis=1)
+            total = cum[:, -1] if cum.shape[1] else np.zeros(len(idx))
+            stuck = total == 0
+            if stuck.any():
+                costs[idx[stuck]] = np.inf
+                active[idx[stuck]] = False
+                keep = ~stuck
+                idx, cur, cum, total = idx[keep], cur[keep], cum[keep], total[keep]
+                weights = weights[keep]
+                if self.neighbors is not None:
+                    cand = cand[keep]
+                if len(idx) == 0:
+                    break
+
+            if q0 >= 1:
+                slot = np.argmax(weights, axis=1)
+            else:
+                r = np.minimum(self.rng.random(len(idx)) * total, np.nextafter(total, 0))
+                slot = (cum <= r[:, None]).sum(axis=1)
+                if q0 > 0:
+                    exploit = self.rng.random(len(idx)) < q0
+                    slot[exploit] = np.argmax(weights[exploit], axis=1)
+            nxt = slot if self.neighbors is None else cand[np.arange(len(idx)), slot]
+
+            if local:
+                tau = self.pheromone[cur, slot]
+                tau = (1 - self.local_decay) * tau + self.local_decay * self.tau0 / self.pheromone_scale
+                self.pheromone[cur, slot] = tau
+                choice[cur, slot] = tau ** self.alpha * self.heuristic[cur, slot]
+
+            costs[idx] += self.distance[cur, slot]
+            visited[idx, nxt] = True
+            current[idx] = nxt
+            active[idx] = ~target[nxt]
+
+            step = np.full(n_ants, -1, dtype=np.intp)
+            step[idx] = nxt
+            steps.append(step)
+            taken = np.full(n_ants, -1, dtype=np.intp)
+            taken[idx] = slot
+            slots.append(taken)
+
+        paths = np.stack(steps, axis=1)
+        slots = np.stack(slots, axis=1) if slots else np.empty((n_ants, 0), dtype=np.intp)
+        lengths = (paths >= 0).sum(axis=1)
+
+        instrument.count("ants_built", n_ants)
+        instrument.count("steps", int(lengths.sum()) - n_ants)
+        instrument.count("prob_evals", evals)
+        return paths, slots, lengths, costs
+
+    def _iterate(self, start, end):
+        """
+        Satu iterasi engine "numpy": bangun jalur semua semut lalu update feromon.
+        :return: (jalur terbaik iterasi ini, cost-nya, rata-rata cost semut)
+        """
+        with instrument.stage("aco.construct"):
+            paths, slots, lengths, costs = self._build_paths(start, end)
+
+        # Update feromon (in-place, feromon bisa berupa shared memory).
+        # Penguapan cukup memperkecil skala global; deposit dibagi skala.
+        with instrument.stage("aco.pheromone"):
+            self._evaporate()
+            self._deposit(paths[:, :-1], slots, costs)
+            self._bound()
+            if self.pheromone_scale < self._min_scale:
+                self._flush_pheromone()
+        instrument.count("iterations")
+
+        i = int(np.argmin(costs))
+        return paths[i, :lengths[i]].tolist(), float(costs[i]), _mean_cost(costs)
+
+    def _deposit(self, rows, cols, costs, elite=True):
+        """
+        Deposit feromon semua semut sekaligus dengan satu np.add.at.
+        :param rows: node asal tiap edge, bentuk (n_ants, langkah), -1 = padding
+        :param cols: kolom feromon tiap edge, bentuk sama dengan rows
+        :param costs: cost jalur tiap semut (inf = gagal, tidak deposit)
+        :param elite: sertakan jalur terbaik sejauh ini (elitist/rank, ACS)
+
+        MMAS: hanya semut terbaik iterasi ini yang deposit. ACS: hanya jalur
+        terbaik sejauh ini (global update), tanpa deposit semut lain.
+        """
+        valid = (cols >= 0) & (rows >= 0)
+        ok = np.isfinite(costs) & (costs > 0) & valid.any(axis=1)
+        amount = np.zeros(len(costs))
+        amount[ok] = 1.0 / costs[ok]
+        best = int(np.argmin(np.where(ok, costs, np.inf))) if ok.any() else None
+
+        if self.variant == "acs":
+            if elite and best is not None:
+                if self._elite is None or costs[best] < self._elite[2]:
+                    self._elite = (rows[best][valid[best]], cols[best][valid[best]], float(costs[best]))
+            if elite and self._elite is not None:
+                self._reinforce(*self._elite)
+            return
+
+        if self.variant == "mmas":
+            amount[np.arange(len(costs)) != best] = 0.0
+            if best is not None and costs[best] < self._best_cost:
+                self._set_bounds(float(costs[best]), int(valid[best].sum()))
+        elif self.deposit == "rank":
+            # hanya rank_size-1 semut terbaik, bobot (w - r) untuk peringkat r
+            w = self.rank_size
+            order = np.argsort(np.where(ok, costs, np.inf))[:w - 1]
+            order = order[ok[order]]
+            weight = np.zeros(len(costs))
+            weight[order] = w - 1 - np.arange(len(order))
+            amount *= weight
+
+        use_elite = self.variant == "as" and self.deposit != "all" and elite
+        if use_elite and best is not None:
+            if self._elite is None or costs[best] < self._elite[2]:
+                self._elite = (rows[best][valid[best]], cols[best][valid[best]], float(costs[best]))
+
+        amount /= self.pheromone_scale
+        np.add.at(self.pheromone, (rows[valid], cols[valid]),
+                  np.broadcast_to(amount[:, None], rows.shape)[valid])
+
+        if use_elite and self._elite is not None:
+            weight = self.elite_weight if self.deposit == "elitist" else self.rank_size
+            self._reinforce(*self._elite, weight=weight)
+
+    def _path_costs(self, rows, cols):
+        """Cost jalur semua semut dengan satu gather pada matriks jarak (-1 = padding)."""
+        valid = (cols >= 0) & (rows >= 0)
+        dist = self.distance[np.where(valid, rows, 0), np.where(valid, cols, 0)]
+        return np.where(valid, dist, 0.0).sum(axis=1)
+
+    @staticmethod
+    def _pack(paths):
+        """Kemas list jalur (panjang berbeda) ke array (n_ants, langkah) berisi -1."""
+        width = max(len(p) for p in paths)
+        packed = np.full((len(paths), width), -1, dtype=np.intp)
+        for k, path in enumerate(paths):
+            packed[k, :len(path)] = path
+        return packed
+
+    def _run_numpy(self, start, end, n_iterations, callback):
+        if self.heuristic is None:
+            self._snapshot()
+        self._init_variant(start, end)
+
         best_path = None
         best_cost = float("inf")
+        t0 = time.perf_counter()
+
+        for it in range(n_iterations):
+            path, cost, mean = self._iterate(start, end)
+            improved = cost < best_cost
+            if improved:
+                best_path = path
+                best_cost = cost
+            self._restart_if_stagnant(improved)
+
+            # catat iterasi ini dulu agar jejak lengkap walau callback berhenti
+            stop = self._converged(best_cost, mean, t0, (best_path or [])[:-1])
+            if callback is not None and callback(it + 1, best_path, best_cost) is False:
+                self.stop_reason = "callback"
+                break
+            if stop:
+                break
 
-        for _ in range(self.n_iterations):
-            all_paths = []
-            all_costs = []
+        self._flush_pheromone()
+        return best_path, best_cost
 
-            for _ in range(self.n_ants):
-                path = self._build_path(start, end)
-                cost = sum(self.graph[path[i]][path[i+1]]['weight']
-                           for i in range(len(path)-1))
-                all_paths.append(path)
-                all_costs.append(cost)
+    def _converged(self, best_cost, mean_cost, t0, nodes):
+        """
+        Catat jejak konvergensi satu iterasi lalu periksa kriteria berhenti.
+        :param nodes: node pada jalur/tree terbaik, tempat branching factor dan
+            entropi diukur (node lain tidak pernah dilewati dan feromonnya
+            tetap seragam)
+        :return: True jika run harus berhenti (alasan di self.stop_reason)
+        """
+        self.convergence["best"].append(best_cost)
+        self.convergence["mean"].append(mean_cost)
+        return self._should_stop(t0, nodes)
+
+    def _should_stop(self, t0, nodes):
+        """
+        Periksa kriteria berhenti terhadap jejak self.convergence dan feromon
+        self.pheromone. :return: True jika berhenti (alasan di self.stop_reason)
+        """
+        best = self.convergence["best"]
+        if self.time_limit is not None and time.perf_counter() - t0 >= self.time_limit:
+            self.stop_reason = "time"
+        elif self.patience is not None and len(best) > self.patience \
+                and best[-1] >= best[-1 - self.patience]:
+            self.stop_reason = "stagnation"
+        elif not nodes:
+            pass
+        elif self.min_branching is not None and self.branching_factor(nodes) <= self.min_branching:
+            self.stop_reason = "branching"
+        elif self.min_entropy is not None and self.pheromone_entropy(nodes) <= self.min_entropy:
+            self.stop_reason = "entropy"
+        return self.stop_reason is not None
+
+    def _edge_mask(self, nodes):
+        """Feromon dan mask edge yang ada (tanpa node mati) untuk baris `nodes`."""
+        nodes = np.asarray(nodes, dtype=np.intp)
+        if self.neighbors is None:
+            valid = np.isfinite(self.distance[nodes]) & ~self.dead
+        else:
+            cand = self.neighbors[nodes]
+            valid = (cand >= 0) & ~self.dead[cand]
+        return self.pheromone[nodes], valid
+
+    def branching_factor(self, nodes):
+        """
+        Rata-rata lambda-branching factor (lambda = 0.05) pada `nodes`: jumlah
+        edge keluar dengan feromon >= min + 0.05 * (max - min). Mendekati 1 =
+        semut di node tersebut hampir selalu memilih edge yang sama.
+        """
+        tau, valid = self._edge_mask(nodes)
+        rows = valid.any(axis=1)
+        if not rows.any():
+            return 1.0
+        tau, valid = tau[rows], valid[rows]
+        hi = np.where(valid, tau, -np.inf).max(axis=1)
+        lo = np.where(valid, tau, np.inf).min(axis=1)
+        threshold = lo + 0.05 * (hi - lo)
+        return float(((tau >= threshold[:, None]) & valid).sum(axis=1).mean())
 
-                if cost < best_cost:
-                    best_path = path
-                    best_cost = cost
+    def pheromone_entropy(self, nodes):
+        """Rata-rata entropi distribusi feromon keluar tiap node di `nodes`, dinormalisasi ke 0..1."""
+        tau, valid = self._edge_mask(nodes)
+        degree = valid.sum(axis=1)
+        rows = degree > 1
+        if not rows.any():
+            return 0.0
+        tau = np.where(valid[rows], tau[rows], 0.0)
+        p = tau / tau.sum(axis=1, keepdims=True)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            h = -np.where(p > 0, p * np.log(p), 0.0).sum(axis=1)
+        return float((h / np.log(degree[rows])).mean())
+
+    def _flush_pheromone(self):
+        """Terapkan skala penguapan lazy ke matriks feromon (skala kembali 1)."""
+        if self.pheromone_scale != 1.0:
+            self.pheromone *= self.dtype.type(self.pheromone_scale)
+            self.pheromone_scale = 1.0
+
+    def _state(self):
+        """Parameter dan snapshot graph yang dibutuhkan koloni di proses lain."""
+        if self.heuristic is None:
+            self._snapshot()
+        return {
+            "n_ants": self.n_ants,
+            "decay": self.decay,
+            "alpha": self.alpha,
+            "beta": self.beta,
+            "dtype": self.dtype,
+            "candidates": self.candidates,
+            "deposit": self.deposit,
+            "elite_weight": self.elite_weight,
+            "rank_size": self.rank_size,
+            "patience": self.patience,
+            "min_branching": self.min_branching,
+            "min_entropy": self.min_entropy,
+            "time_limit": self.time_limit,
+            "variant": self.variant,
+            "q0": self.q0,
+            "local_decay": self.local_decay,
+            "p_best": self.p_best,
+            "restart_after": self.restart_after,
+            "tau0": self.tau0,
+            "tau_min": self.tau_min,
+            "tau_max": self.tau_max,
+            "_best_cost": self._best_cost,
+            "_min_scale": self._min_scale,
+            "num_nodes": self.num_nodes,
+            "distance": self.distance,
+            "heuristic": self.heuristic,
+            "_goal": self._goal,
+            "_remaining": self._remaining,
+            "neighbors": self.neighbors,
+            "dead": self.dead,
+        }
+
+    @classmethod
+    def _from_state(cls, state, pheromone, seed):
+        """Buat koloni engine "numpy" tanpa graph dari hasil _state()."""
+        colony = cls.__new__(cls)
+        colony.graph = None
+        colony.n_iterations = 0
+        colony.engine = "numpy"
+        colony._goal = colony._remaining = None  # state dari bundle tidak menyimpannya
+        colony.__dict__.update(state)
+        colony.pheromone = pheromone
+        colony.pheromone_scale = 1.0
+        colony._elite = None
+        colony._fresh = False
+        colony.restarts = colony._stale = 0
+        colony.choice_info = None
+        colony.rng = np.random.default_rng(seed)
+        return colony
+
+    def run_islands(self, start, end, n_colonies=4, exchange_every=10,
+                    exchange_rate=0.5, n_workers=None, seed=None):
+        """
+        Island model: jalankan n_colonies koloni independen di process pool.
+        Setiap exchange_every iterasi, feromon tiap koloni dicampur dengan
+        rata-rata semua koloni dan jalur terbaik global dideposit ke semua
+        koloni. Matriks feromon berada di shared memory sehingga tidak
+        di-pickle tiap pertukaran. Hasil deterministik untuk seed yang sama
+        (tidak bergantung pada n_workers).
+        :param n_colonies: jumlah koloni (K)
+        :param exchange_every: interval pertukaran dalam iterasi (M)
+        :param exchange_rate: bobot rata-rata feromon saat pencampuran (0..1)
+        :param n_workers: jumlah proses; None = min(K, jumlah CPU)
+        :param seed: seed utama; None = acak
+        :return: (best_path, best_cost); konvergensi per koloni (cost terbaik
+            sejauh ini per iterasi, lintas pertukaran) tersimpan di
+            self.island_history, jejak global (best = terbaik semua koloni,
+            mean = rata-rata cost semut semua koloni) di self.convergence.
+            Kriteria berhenti (patience, min_branching, min_entropy,
+            time_limit) diperiksa setiap selesai pertukaran terhadap best
+            global dan feromon koloni terbaik, jadi granularitasnya
+            exchange_every iterasi
+        """
+        if self.engine != "numpy":
+            raise ValueError("run_islands memerlukan engine 'numpy'")
+        if seed is None:
+            seed = np.random.SeedSequence().entropy
+        if n_workers is None:
+            n_workers = min(n_colonies, os.cpu_count() or 1)
+        self._reset_convergence()
+        self._init_variant(start, end)
+        t0 = time.perf_counter()
+
+        shape = self.pheromone.shape
+        shm = shared_memory.SharedMemory(create=True, size=n_colonies * self.pheromone.nbytes)
+        try:
+            pheromones = np.ndarray((n_colonies,) + shape, dtype=self.pheromone.dtype, buffer=shm.buf)
+            pheromones[:] = self.pheromone
+
+            best_path = None
+            best_cost = float("inf")
+            history = [[] for _ in range(n_colonies)]
+            colony_best = [float("inf")] * n_colonies
+            initargs = (self._state(), shm.name, pheromones.shape, pheromones.dtype.str)
+
+            with multiprocessing.Pool(n_workers, initializer=_island_init, initargs=initargs) as pool:
+                done, epoch = 0, 0
+                while done < self.n_iterations:
+                    iterations = min(exchange_every, self.n_iterations - done)
+                    tasks = [(k, (seed, k, epoch), iterations, start, end, colony_best[k])
+                             for k in range(n_colonies)]
+                    results = pool.map(_island_epoch, tasks)
+
+                    for k, (path, cost, trace, _) in enumerate(results):
+                        history[k].extend(trace)
+                        colony_best[k] = min(colony_best[k], cost)
+                        if cost < best_cost:
+                            best_path = path
+                            best_cost = cost
+                    self.convergence["best"].extend(np.min([r[2] for r in results], axis=0).tolist())
+                    self.convergence["mean"].extend(np.mean([r[3] for r in results], axis=0).tolist())
+
+                    # Pertukaran antar koloni
+                    mean = pheromones.mean(axis=0)
+                    pheromones *= (1 - exchange_rate)
+                    pheromones += exchange_rate * mean
+                    if best_path is not None and len(best_path) > 1:
+                        rows, cols = self._path_slots(best_path)
+                        pheromones[:, rows, cols] += 1.0 / best_cost
+
+                    done += iterations
+                    epoch += 1
+
+                    own = self.pheromone
+                    self.pheromone = pheromones[int(np.argmin(colony_best))]
+                    try:
+                        if self._should_stop(t0, (best_path or [])[:-1]):
+                            break
+                    finally:
+                        self.pheromone = own
+
+            best_colony = int(np.argmin([min(h, default=np.inf) for h in history]))
+            self.pheromone = pheromones[best_colony].copy()
+            self.island_history = history
+            if self.stop_reason is None:
+                self.stop_reason = "iterations"
+        finally:
+            shm.close()
+            shm.unlink()
+
+        return best_path, best_cost
+
+    def _path_slots(self, path):
+        """Indeks (baris, kolom) feromon untuk setiap edge pada path."""
+        path = np.asarray(path, dtype=np.intp)
+        rows, nxt = path[:-1], path[1:]
+        if self.neighbors is None:
+            return rows, nxt
+        cols = np.argmax(self.neighbors[rows] == nxt[:, None], axis=1)
+        return rows, cols
+
+    def run(self, start, end, n_iterations=None, callback=None):
+        """
+        :param n_iterations: jumlah iterasi untuk run ini; None = self.n_iterations
+            (berguna untuk re-konvergensi singkat setelah warm start)
+        :param callback: fungsi (iterasi, best_path, best_cost) yang dipanggil
+            setiap akhir iterasi; jika mengembalikan False, run dihentikan
+        :return: (best_path, best_cost); jejak best/mean cost per iterasi ada
+            di self.convergence dan alasan berhenti di self.stop_reason
+            ("iterations", "stagnation", "branching", "entropy", "time",
+            "callback")
+        """
+        if n_iterations is None:
+            n_iterations = self.n_iterations
+        self._elite = None
+        self._reset_convergence()
+        with instrument.stage("aco.run"):
+            if self.engine == "numpy":
+                result = self._run_numpy(start, end, n_iterations, callback)
+            else:
+                result = self._run_python(start, end, n_iterations, callback)
+        if self.stop_reason is None:
+            self.stop_reason = "iterations"
+        return result
+
+    def _reset_convergence(self):
+        self.convergence = {"best": [], "mean": []}
+        self.stop_reason = None
+        self.restarts = 0
+        self._stale = 0
+
+    def run_multi(self, sources, sink, n_iterations=None, callback=None):
+        """
+        Routing banyak sumber (mis. semua cluster head) ke satu sink dalam satu
+        run dengan feromon bersama (engine "numpy").
+
+        Routing tree terbaik disimpan sebagai next hop + biaya ke sink per
+        node. Semut berhenti begitu mencapai node yang sudah punya rute ke sink
+        dan memakai ulang suffix tersebut; edge yang dilalui kemudian direlaksasi
+        (Bellman-Ford) sehingga node di sepanjang jalur ikut mendapat rute.
+        Setiap iterasi max(n_ants, len(sources)) semut dibagi rata ke sources.
+        :param sources: node sumber
+        :param sink: node tujuan bersama
+        :param callback: fungsi (iterasi, tree, total_cost) setiap akhir
+            iterasi; jika mengembalikan False, run dihentikan
+        :return: (tree, costs); tree berupa dict {node: next hop} untuk semua
+            node pada rute sumber, costs array biaya tiap sumber ke sink
+            (urutan sama dengan sources tanpa sink; inf jika belum terhubung).
+            Tanpa sumber selain sink hasilnya ({}, array kosong).
+        """
+        if self.engine != "numpy":
+            raise ValueError("run_multi hanya didukung engine 'numpy'")
+        if n_iterations is None:
+            n_iterations = self.n_iterations
+        self._reset_convergence()
+        sources = np.asarray(sources, dtype=np.intp)
+        sources = sources[sources != sink]
+        if not len(sources):
+            self.stop_reason = "iterations"
+            return {}, np.empty(0)
+
+        with instrument.stage("aco.run"):
+            if self.heuristic is None:
+                self._snapshot()
+            self._init_variant(sources, sink)
+
+            n = self.num_nodes
+            next_hop = np.full(n, -1, dtype=np.intp)
+            label = np.full(n, np.inf)  # biaya ke sink lewat next_hop
+            label[sink] = 0.0
+            n_ants = max(self.n_ants, len(sources))
+            t0 = time.perf_counter()
+
+            for it in range(n_iterations):
+                starts = np.roll(sources, -it)[np.arange(n_ants) % len(sources)]
+                with instrument.stage("aco.construct"):
+                    paths, slots, lengths, costs = self._build_paths(starts, np.isfinite(label))
+
+                with instrument.stage("aco.pheromone"):
+                    self._evaporate()
+                    last = paths[np.arange(len(paths)), lengths - 1]
+                    # routing tree terbaik sudah berperan sebagai elite
+                    totals = costs + label[last]
+                    self._deposit(paths[:, :-1], slots, totals, elite=False)
+
+                    for path, slot, length, cost in zip(paths, slots, lengths, costs):
+                        if length < 2 or not np.isfinite(cost):
+                            continue
+                        # relaksasi dari ujung jalur ke awal
+                        for k in range(length - 2, -1, -1):
+                            u, v = path[k], path[k + 1]
+                            d = label[v] + self.distance[u, slot[k]]
+                            if d < label[u]:
+                                label[u] = d
+                                next_hop[u] = v
+
+                    # perkuat rute terbaik tiap sumber (seperti deposit global best)
+                    for source in sources[np.isfinite(label[sources])]:
+                        rows, cols = self._path_slots(self._route(next_hop, source, sink))
+                        self._reinforce(rows, cols, max(label[source], 1e-12))
+                    self._bound()
+                    if self.pheromone_scale < self._min_scale:
+                        self._flush_pheromone()
+                instrument.count("iterations")
+
+                total_cost = float(label[sources].sum())
+                best = self.convergence["best"]
+                self._restart_if_stagnant(not best or total_cost < min(best))
+                tree = self._tree(next_hop, sources, sink)
+                stop = self._converged(total_cost, _mean_cost(totals), t0, list(tree))
+                if callback is not None and callback(it + 1, tree, total_cost) is False:
+                    self.stop_reason = "callback"
+                    break
+                if stop:
+                    break
+
+            self._flush_pheromone()
+        if self.stop_reason is None:
+            self.stop_reason = "iterations"
+
+        # label bisa lebih besar dari biaya rute sebenarnya (suffix membaik
+        # setelah label diset), jadi biaya akhir dihitung ulang dari tree
+        costs = np.full(len(sources), np.inf)
+        for k, source in enumerate(sources):
+            if np.isfinite(label[source]):
+                rows, cols = self._path_slots(self._route(next_hop, source, sink))
+                costs[k] = self.distance[rows, cols].sum()
+        return self._tree(next_hop, sources, sink), costs
+
+    @staticmethod
+    def _route(next_hop, source, sink):
+        """Jalur source -> sink mengikuti next_hop."""
+        path = [int(source)]
+        while path[-1] != sink:
+            path.append(int(next_hop[path[-1]]))
+        return path
+
+    @staticmethod
+    def _tree(next_hop, sources, sink):
+        """Potong next_hop menjadi dict {node: next hop} untuk rute dari sources."""
+        tree = {}
+        for u in sources.tolist():
+            while u != sink and u not in tree and next_hop[u] >= 0:
+                tree[u] = int(next_hop[u])
+                u = tree[u]
+        return tree
+
+    def _run_python(self, start, end, n_iterations, callback):
+        best_path = None
+        best_cost = float("inf")
+        t0 = time.perf_counter()
+
+        if self.heuristic is None:
+            self._snapshot()  # matriks jarak untuk evaluasi cost
+
+        for it in range(n_iterations):
+            with instrument.stage("aco.construct"):
+                all_paths = [self._build_path(start, end) for _ in range(self.n_ants)]
+                paths = self._pack(all_paths)
+                rows, cols = paths[:, :-1], paths[:, 1:]
+                all_costs = self._path_costs(rows, cols)
+
+                i = int(np.argmin(all_costs))
+                if all_costs[i] < best_cost:
+                    best_path = all_paths[i]
+                    best_cost = float(all_costs[i])
 
             # Update feromon
-            self.pheromone *= (1 - self.decay)
-            for path, cost in zip(all_paths, all_costs):
-                for i in range(len(path)-1):
-                    self.pheromone[path[i]][path[i+1]] += 1.0 / cost
+            with instrument.stage("aco.pheromone"):
+                self.pheromone *= (1 - self.decay)
+                self._deposit(rows, cols, all_costs)
+                self.choice_info = None  # dihitung ulang sekali di iterasi berikutnya
+            instrument.count("iterations")
+
+            stop = self._converged(best_cost, _mean_cost(all_costs), t0, (best_path or [])[:-1])
+            if callback is not None and callback(it + 1, best_path, best_cost) is False:
+                self.stop_reason = "callback"
+                break
+            if stop:
+                break
+
+        return best_path, best_cost
+
+
+def _mean_cost(costs):
+    """Rata-rata cost semut yang berhasil (inf jika tidak ada)."""
+    ok = np.isfinite(costs)
+    return float(costs[ok].mean()) if ok.any() else float("inf")
+
+
+# ---------- Worker island model (harus top-level agar bisa di-pickle) ----------
+_island = {}
+
+
+def _island_init(state, shm_name, shape, dtype):
+    # resource tracker dipakai bersama proses utama, yang melakukan unlink
+    shm = shared_memory.SharedMemory(name=shm_name)
+    _island["shm"] = shm
+    _island["state"] = state
+    _island["pheromones"] = np.ndarray(shape, dtype=np.dtype(dtype), buffer=shm.buf)
+
+
+def _island_epoch(task):
+    k, seed, iterations, start, end, best_cost = task
+    colony = AntColony._from_state(_island["state"], _island["pheromones"][k], seed)
 
-        return best_path, best_cost
\ No newline at end of file
+    # best_cost = terbaik koloni dari epoch sebelumnya, agar jejak tidak
+    # kembali naik setiap pertukaran
+    best_path = None
+    trace, means = [], []
+    for _ in range(iterations):
+        path, cost, mean = colony._iterate(start, end)
+        if cost < best_cost:
+            best_path = path
+            best_cost = cost
+        trace.append(best_cost)
+        means.append(mean)
+    colony._flush_pheromone()
+    return best_path, best_cost, trace, means
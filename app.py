@@ -1,18 +1,94 @@
 # app.py
+import os
 import sys
+import time
+import numpy as np
 from PyQt5.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QLabel,
     QPushButton, QFormLayout, QSpinBox, QTextEdit,
-    QStatusBar, QStackedWidget, QHBoxLayout, QFrame, QGridLayout
+    QStatusBar, QStackedWidget, QHBoxLayout, QFrame, QGridLayout,
+    QProgressBar, QFileDialog
 )
-from PyQt5.QtCore import Qt
+from PyQt5.QtCore import Qt, QObject, QThread, pyqtSignal
 from PyQt5.QtGui import QFont
-from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
-import matplotlib.pyplot as plt
 
-from wsn import WSN
-from heed import HEED
-from aco import AntColony
+# matplotlib, networkx dan engine simulasi diimpor saat pertama dipakai
+# (halaman visualisasi / worker) agar jendela awal tampil cepat
+from wsn import (WSN, CLUSTER_CMAP, CLUSTER_COLORS, MAX_POINTS,
+                 cluster_colors, cluster_legend, decimate)
+from export import export_result, save_figures_pdf
+import instrument
+
+
+class SimulationWorker(QObject):
+    """Menjalankan pipeline WSN -> HEED -> ACO -> energi di luar thread GUI."""
+    clustered = pyqtSignal(object)             # wsn setelah clustering HEED
+    progress = pyqtSignal(int, float, object)  # iterasi, total biaya, tree {node: next hop}
+    finished = pyqtSignal(dict)
+    failed = pyqtSignal(str)
+
+    def __init__(self, num_nodes, area, n_ants, n_iter, seed=None):
+        super().__init__()
+        self.num_nodes = num_nodes
+        self.area = area
+        self.n_ants = n_ants
+        self.n_iter = n_iter
+        self.seed = seed  # None = deployment acak
+        self._cancelled = False
+
+    def cancel(self):
+        self._cancelled = True
+
+    def _on_iteration(self, iteration, tree, total_cost):
+        self.progress.emit(iteration, total_cost, dict(tree))
+        return not self._cancelled
+
+    def run(self):
+        # profiler opsional: WSN_PROFILE=cprofile / pyinstrument
+        stats = instrument.enable(profile=os.environ.get("WSN_PROFILE") or None)
+        try:
+            from aco import AntColony
+            import cache
+
+            # dengan seed, graph/jarak/HEED diambil dari cache jika deployment sama
+            wsn = WSN(num_nodes=self.num_nodes, area_size=self.area, init_energy=1.0, seed=self.seed)
+            ch = cache.select_cluster_heads(wsn, seed=self.seed)
+            self.clustered.emit(wsn)
+
+            # semua CH dirutekan ke sink (node terakhir) dalam satu run ACO
+            sink = wsn.num_nodes - 1
+            result = {"wsn": wsn, "ch": ch, "sink": sink, "tree": {}, "ch_costs": {},
+                      "best_cost": float("inf"), "energies": [],
+                      "cancelled": self._cancelled, "stats": stats}
+            sources = [c for c in ch if c != sink]
+            if not sources:
+                # HEED hanya memilih sink sebagai CH: tidak ada yang dirutekan
+                result["best_cost"] = 0.0
+            if self._cancelled or not sources:
+                stats.stop_profile()
+                self.finished.emit(result)
+                return
+
+            # deployment acak (tanpa seed) tidak akan terulang: jangan di-cache
+            if self.seed is None:
+                graph, distance = wsn.build_graph(), None
+            else:
+                graph, distance = cache.build_graph(wsn), cache.distance_matrix(wsn)
+            # berhenti lebih awal jika total biaya tidak membaik 50 iterasi
+            aco = AntColony(graph, n_ants=self.n_ants, n_iterations=self.n_iter, decay=0.5,
+                            engine="numpy", patience=50, seed=self.seed, distance=distance)
+            tree, costs = aco.run_multi(sources, sink, callback=self._on_iteration)
+            result.update(graph=graph, colony=aco, tree=tree,
+                          ch_costs=dict(zip(sources, costs.tolist())),
+                          best_cost=float(costs.sum()), cancelled=self._cancelled,
+                          iterations=len(aco.convergence["best"]), stop_reason=aco.stop_reason)
+
+            if tree:
+                result["energies"] = wsn.simulate_transmission(sorted(set(tree) | {sink}))
+            stats.stop_profile()
+            self.finished.emit(result)
+        except Exception as exc:
+            self.failed.emit(str(exc))
 
 
 class WSNApp(QMainWindow):
@@ -40,8 +116,12 @@ class WSNApp(QMainWindow):
             QTextEdit { background: white; border: 1px solid #dfe6ee; }
         """)
 
-        # Prepare matplotlib default style for clarity
-        plt.rcParams.update({'font.size': 10})
+        # Worker simulasi yang sedang berjalan (None jika idle)
+        self.sim_thread = None
+        self.sim_worker = None
+        self._last_route_draw = 0.0
+        self._last_result = None  # hasil simulasi terakhir (untuk disimpan)
+        self.visual_page = None   # dibuat saat pertama dibuka (ensure_visual_page)
 
         # Tambahkan semua halaman
         self.init_welcome_page()
@@ -49,7 +129,6 @@ class WSNApp(QMainWindow):
         self.init_panduan_page()
         self.init_parameter_page()
         self.init_summary_page()
-        self.init_visual_page()
 
         # Tampilkan welcome page pertama kali
         self.stack.setCurrentWidget(self.welcome_page)
@@ -162,8 +241,8 @@ class WSNApp(QMainWindow):
         text.setReadOnly(True)
         text.setPlainText(
             "1. Klik menu Simulasi atau pilih 'Simulasi' pada halaman menu.\n"
-            "2. Pada halaman Simulasi, atur parameter: Jumlah Node, Ukuran Area, Jumlah Semut, dan Jumlah Iterasi.\n"
-            "3. Tekan tombol 'Jalankan Simulasi'. Tunggu hingga proses selesai.\n"
+            "2. Pada halaman Simulasi, atur parameter: Jumlah Node, Ukuran Area, Jumlah Semut, dan Jumlah Iterasi. Isi Seed Deployment agar posisi node sama di setiap run (setup graph dipakai ulang).\n"
+            "3. Tekan tombol 'Jalankan Simulasi'. Progres ACO tampil di halaman Visualisasi; tekan 'Batal' untuk menghentikan lebih awal.\n"
             "4. Setelah selesai, Anda akan melihat ringkasan hasil. Untuk melihat detail grafik, tekan 'Lihat Visualisasi'.\n\n"
             "Catatan: Untuk screenshot dokumen HKI, gunakan halaman Ringkasan dan Visualisasi."
         )
@@ -225,15 +304,23 @@ class WSNApp(QMainWindow):
         self.iter_input.setValue(50)
         self.iter_input.setFixedWidth(140)
 
+        self.seed_input = QSpinBox()
+        self.seed_input.setRange(0, 999999)
+        self.seed_input.setValue(0)
+        self.seed_input.setSpecialValueText("Acak")  # 0 = deployment acak
+        self.seed_input.setFixedWidth(140)
+
         form.addRow("Jumlah Node:", self.node_input)
         form.addRow("Ukuran Area (px):", self.area_input)
         form.addRow("Jumlah Semut (ACO):", self.ants_input)
         form.addRow("Jumlah Iterasi (ACO):", self.iter_input)
+        form.addRow("Seed Deployment:", self.seed_input)
 
         run_button = QPushButton("Jalankan Simulasi")
         run_button.setProperty("class", "primary")
         run_button.setFixedSize(220, 48)
         run_button.clicked.connect(self.run_simulation)
+        self.run_button = run_button
 
         btn_back = QPushButton("⬅️ Kembali ke Menu")
         btn_back.setFixedSize(160, 40)
@@ -265,15 +352,34 @@ class WSNApp(QMainWindow):
 
         btn_next = QPushButton("➡️ Lihat Visualisasi")
         btn_next.setFixedSize(200, 40)
-        btn_next.clicked.connect(lambda: self.stack.setCurrentWidget(self.visual_page))
+        btn_next.clicked.connect(lambda: self.stack.setCurrentWidget(self.ensure_visual_page()))
 
         btn_back = QPushButton("⬅️ Kembali ke Simulasi")
         btn_back.setFixedSize(160, 40)
         btn_back.clicked.connect(lambda: self.stack.setCurrentWidget(self.param_page))
 
+        # simpan deployment, graph, feromon dan jejak ke bundle .npy (memmap)
+        self.save_button = QPushButton("💾 Simpan Hasil")
+        self.save_button.setFixedSize(160, 40)
+        self.save_button.setEnabled(False)
+        self.save_button.clicked.connect(self.save_result)
+
+        # ekspor data (Excel/CSV/Parquet) dan grafik (PDF)
+        self.export_button = QPushButton("📤 Ekspor Data")
+        self.export_button.setFixedSize(160, 40)
+        self.export_button.setEnabled(False)
+        self.export_button.clicked.connect(self.export_data)
+        self.pdf_button = QPushButton("📄 Ekspor PDF")
+        self.pdf_button.setFixedSize(160, 40)
+        self.pdf_button.setEnabled(False)
+        self.pdf_button.clicked.connect(self.export_pdf)
+
         nav = QHBoxLayout()
         nav.addWidget(btn_back)
         nav.addStretch()
+        nav.addWidget(self.export_button)
+        nav.addWidget(self.pdf_button)
+        nav.addWidget(self.save_button)
         nav.addWidget(btn_next)
 
         layout.addWidget(title)
@@ -284,7 +390,20 @@ class WSNApp(QMainWindow):
         self.stack.addWidget(self.summary_page)
 
     # ----------  Page 5: Visualisasi (grid 2x2) ----------
+    def ensure_visual_page(self):
+        """Halaman visualisasi beserta figure-nya dibuat saat pertama dibutuhkan."""
+        if self.visual_page is None:
+            self.init_visual_page()
+        return self.visual_page
+
     def init_visual_page(self):
+        import matplotlib
+        from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
+        from matplotlib.figure import Figure
+
+        # Prepare matplotlib default style for clarity
+        matplotlib.rcParams.update({'font.size': 10})
+
         self.visual_page = QWidget()
         layout = QVBoxLayout()
         layout.setContentsMargins(30, 20, 30, 20)
@@ -292,13 +411,30 @@ class WSNApp(QMainWindow):
 
         title = QLabel("Visualisasi Hasil Simulasi")
         title.setFont(QFont("Segoe UI", 16, QFont.Bold))
-        layout.addWidget(title)
+
+        # progress ACO + tombol batal (tampil hanya saat simulasi berjalan)
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setFormat("Iterasi %v / %m")
+        self.progress_bar.setFixedWidth(320)
+        self.progress_label = QLabel("")
+        self.cancel_button = QPushButton("Batal")
+        self.cancel_button.setFixedSize(120, 36)
+        self.cancel_button.clicked.connect(self.cancel_simulation)
+
+        header = QHBoxLayout()
+        header.addWidget(title)
+        header.addStretch()
+        header.addWidget(self.progress_label)
+        header.addWidget(self.progress_bar)
+        header.addWidget(self.cancel_button)
+        layout.addLayout(header)
+        self._set_running(False)
 
         grid = QGridLayout()
         grid.setSpacing(12)
 
         # create 4 figures and canvas
-        self.figures = [plt.figure(figsize=(6, 4)) for _ in range(4)]
+        self.figures = [Figure(figsize=(6, 4)) for _ in range(4)]
         self.canvases = [FigureCanvas(fig) for fig in self.figures]
         vis_titles = ["Topologi Awal", "Clustering HEED", "Routing ACO", "Energi Residual"]
 
@@ -315,6 +451,7 @@ class WSNApp(QMainWindow):
             grid.addWidget(frame, i // 2, i % 2)
 
         layout.addLayout(grid)
+        self._init_artists()
 
         btn_back = QPushButton("⬅️ Kembali ke Ringkasan")
         btn_back.setFixedSize(200, 40)
@@ -324,74 +461,266 @@ class WSNApp(QMainWindow):
         self.visual_page.setLayout(layout)
         self.stack.addWidget(self.visual_page)
 
+    def _init_artists(self):
+        """
+        Buat artist persisten sekali; run berikutnya cukup memperbarui datanya
+        (set_offsets/set_data/set_segments) tanpa ax.clear().
+        """
+        from matplotlib.collections import LineCollection
+
+        self.axes = [fig.add_subplot(111) for fig in self.figures]
+        titles = ["Topologi Awal", "Clustering HEED", "Routing ACO", "Energi Residual Node"]
+        for ax, t in zip(self.axes, titles):
+            ax.set_title(t)
+            ax.set_xlabel("X")
+            ax.set_ylabel("Y")
+        self.axes[3].set_xlabel("Round")
+        self.axes[3].set_ylabel("Energi Rata-rata")
+
+        empty = np.empty((0, 2))
+        self.topo_scatter = self.axes[0].scatter(empty[:, 0], empty[:, 1], c="#2b7cff", s=12)
+        self.cluster_scatter = self.axes[1].scatter(
+            empty[:, 0], empty[:, 1], c=np.empty(0), cmap=CLUSTER_CMAP,
+            vmin=0, vmax=CLUSTER_COLORS - 1, s=12)
+
+        # rute digambar dengan blitting: animated=True -> tidak ikut draw penuh,
+        # digambar di atas background yang disimpan pada draw_event
+        self.route_lines = LineCollection([], colors="r", linewidths=1, animated=True)
+        self.axes[2].add_collection(self.route_lines)
+        self.sink_marker, = self.axes[2].plot([], [], "ks", ms=7)
+        self._route_bg = None
+        self.canvases[2].mpl_connect("draw_event", self._on_route_draw)
+
+        self.energy_line, = self.axes[3].plot([], [], marker="o")
+
+    def _on_route_draw(self, event):
+        canvas, ax = self.canvases[2], self.axes[2]
+        if event.canvas is not canvas:  # mis. savefig ke PDF
+            return
+        self._route_bg = canvas.copy_from_bbox(ax.bbox)
+        ax.draw_artist(self.route_lines)
+
+    def _blit_route(self):
+        """Gambar ulang hanya rute di atas background tersimpan."""
+        if self._route_bg is None:
+            self._draw(2)
+            return
+        canvas, ax = self.canvases[2], self.axes[2]
+        with instrument.stage("draw"):
+            canvas.restore_region(self._route_bg)
+            ax.draw_artist(self.route_lines)
+            canvas.blit(ax.bbox)
+        instrument.count("canvas_blits")
+
     # ---------- Simulasi ----------
+    def _set_running(self, running):
+        self.progress_bar.setVisible(running)
+        self.progress_label.setVisible(running)
+        self.cancel_button.setVisible(running)
+        self.cancel_button.setEnabled(running)
+        self.run_button.setEnabled(not running)
+
     def run_simulation(self):
+        if self.sim_thread is not None:
+            return
+
         # read params
         num_nodes = self.node_input.value()
         area = self.area_input.value()
         n_ants = self.ants_input.value()
         n_iter = self.iter_input.value()
+        seed = self.seed_input.value() or None
+        self.ensure_visual_page()
 
         self.statusBar.showMessage("Menjalankan simulasi...")
-
-        # initialize WSN
-        wsn = WSN(num_nodes=num_nodes, area_size=area, init_energy=1.0)
+        self.progress_bar.setRange(0, n_iter)
+        self.progress_bar.setValue(0)
+        self.progress_label.setText("Clustering HEED...")
+        self._set_running(True)
+        self._last_route_draw = 0.0
+
+        self.sim_thread = QThread()
+        self.sim_worker = SimulationWorker(num_nodes, area, n_ants, n_iter, seed)
+        self.sim_worker.moveToThread(self.sim_thread)
+        self.sim_thread.started.connect(self.sim_worker.run)
+        self.sim_worker.clustered.connect(self.on_clustered)
+        self.sim_worker.progress.connect(self.on_progress)
+        self.sim_worker.finished.connect(self.on_simulation_finished)
+        self.sim_worker.failed.connect(self.on_simulation_failed)
+        self.sim_worker.finished.connect(self.sim_thread.quit)
+        self.sim_worker.failed.connect(self.sim_thread.quit)
+        self.sim_thread.finished.connect(self._cleanup_thread)
+        self.sim_thread.start()
+
+        # tampilkan visualisasi agar hasil parsial terlihat selama ACO berjalan
+        self.stack.setCurrentWidget(self.visual_page)
+
+    def cancel_simulation(self):
+        if self.sim_worker is not None:
+            self.sim_worker.cancel()
+            self.cancel_button.setEnabled(False)
+            self.statusBar.showMessage("Membatalkan simulasi...")
+
+    def _cleanup_thread(self):
+        self.sim_worker.deleteLater()
+        self.sim_thread.deleteLater()
+        self.sim_worker = None
+        self.sim_thread = None
+
+    def on_clustered(self, wsn):
+        idx = decimate(wsn.num_nodes, MAX_POINTS)
+        for ax in self.axes[:3]:
+            ax.set_xlim(0, wsn.area_size)
+            ax.set_ylim(0, wsn.area_size)
 
         # Topologi
-        ax = self.figures[0].gca()
-        ax.clear()
-        ax.scatter(wsn.pos[:, 0], wsn.pos[:, 1], c="#2b7cff", s=30)
-        ax.set_title("Topologi Awal")
-        ax.set_xlabel("X")
-        ax.set_ylabel("Y")
-        self.canvases[0].draw()
-
-        # HEED
-        heed = HEED(wsn)
-        ch = heed.select_cluster_heads()
-        ax = self.figures[1].gca()
-        ax.clear()
-        wsn.plot_clusters(title="Clustering HEED", ax=ax)
-        self.canvases[1].draw()
+        self.topo_scatter.set_offsets(wsn.pos[idx])
+        self._draw(0)
+
+        # HEED: satu scatter, warna dari indeks cluster
+        ids, color = cluster_colors(wsn.clusters)
+        self.cluster_scatter.set_offsets(wsn.pos[idx])
+        self.cluster_scatter.set_array(color[idx])
+        cluster_legend(self.axes[1], ids)
+        self._draw(1)
+
+        # Routing: kosongkan rute lama, tandai sink
+        sink = wsn.num_nodes - 1
+        self.route_lines.set_segments([])
+        self.sink_marker.set_data([wsn.pos[sink, 0]], [wsn.pos[sink, 1]])
+        self._draw(2)
+
+        self.energy_line.set_data([], [])
+        self._draw(3)
+
+        self._wsn = wsn
+        self.progress_label.setText("ACO...")
+
+    def on_progress(self, iteration, total_cost, tree):
+        self.progress_bar.setValue(iteration)
+        self.progress_label.setText(f"Iterasi {iteration}, total biaya CH: {total_cost:.2f}")
+
+        # blit routing tree parsial, dibatasi ~20 kali per detik
+        now = time.monotonic()
+        if tree and now - self._last_route_draw >= 0.05:
+            self._last_route_draw = now
+            self.route_lines.set_segments(self._wsn.tree_segments(tree))
+            self._blit_route()
+
+    def _draw(self, index):
+        with instrument.stage("draw"):
+            self.canvases[index].draw()
+        instrument.count("canvas_draws")
+
+    def on_simulation_failed(self, message):
+        instrument.disable()
+        self._set_running(False)
+        self.statusBar.showMessage(f"Simulasi gagal: {message}")
+
+    def on_simulation_finished(self, result):
+        self._set_running(False)
+        self._last_result = result
+        for button in (self.save_button, self.export_button, self.pdf_button):
+            button.setEnabled(True)
+        wsn = result["wsn"]
+        tree = result["tree"]
+        best_cost = result["best_cost"]
+        energies = result["energies"]
 
         # ACO
-        graph = wsn.build_graph()
-        aco = AntColony(graph, n_ants=n_ants, n_iterations=n_iter, decay=0.5)
-        best_path, best_cost = aco.run(start=0, end=len(graph) - 1)
-        ax = self.figures[2].gca()
-        ax.clear()
-        wsn.plot_routing(best_path, title="Routing ACO", ax=ax)
-        self.canvases[2].draw()
+        self.route_lines.set_segments(wsn.tree_segments(tree))
+        self._draw(2)
 
         # Energi
-        energies = wsn.simulate_transmission(best_path)
-        ax = self.figures[3].gca()
-        ax.clear()
-        ax.plot(energies, marker="o")
-        ax.set_title("Energi Residual Node")
-        ax.set_xlabel("Round")
-        ax.set_ylabel("Energi Rata-rata")
-        self.canvases[3].draw()
+        ax = self.axes[3]
+        self.energy_line.set_data(np.arange(len(energies)), energies)
+        ax.relim()
+        ax.autoscale_view()
+        self._draw(3)
+        instrument.disable()
 
         # Ringkasan
+        status = " (dibatalkan, hasil parsial)" if result["cancelled"] else ""
         summary = (
-            f"📊 Ringkasan Hasil Simulasi\n\n"
-            f"- Jumlah Node       : {num_nodes}\n"
-            f"- Ukuran Area       : {area} x {area}\n"
-            f"- Cluster Head      : {ch}\n"
-            f"- Jalur ACO         : {best_path}\n"
-            f"- Biaya Routing     : {best_cost:.2f}\n"
-            f"- Energi Akhir Rata : {energies[-1]:.2f}\n"
+            f"📊 Ringkasan Hasil Simulasi{status}\n\n"
+            f"- Jumlah Node       : {wsn.num_nodes}\n"
+            f"- Ukuran Area       : {wsn.area_size} x {wsn.area_size}\n"
+            f"- Cluster Head      : {result['ch']}\n"
+            f"- Sink              : node {result['sink']}\n"
+            f"- Biaya Routing     : {best_cost:.2f} (total {len(result['ch_costs'])} CH)\n"
         )
+        if "iterations" in result:
+            summary += f"- Iterasi ACO       : {result['iterations']} ({result['stop_reason']})\n"
+        for c, cost in result["ch_costs"].items():
+            summary += f"    CH {c:<4} -> sink : {cost:.2f}\n"
+        if energies:
+            summary += f"- Energi Akhir Rata : {energies[-1]:.2f}\n"
+        stats = result["stats"]
+        summary += f"\n⏱️ Statistik Per Tahap\n{stats.format_report()}\n"
+        if stats.profile_text:
+            summary += f"\nProfil\n{stats.profile_text}"
         self.summary_text.setPlainText(summary)
 
         # pindah ke ringkasan otomatis
         self.stack.setCurrentWidget(self.summary_page)
-        self.statusBar.showMessage("Simulasi selesai")
+        self.statusBar.showMessage("Simulasi dibatalkan" if result["cancelled"] else "Simulasi selesai")
+
+    def save_result(self):
+        result = self._last_result
+        if result is None:
+            return
+        path = QFileDialog.getExistingDirectory(self, "Pilih folder bundle hasil")
+        if not path:
+            return
+        from bundle import save_bundle
+
+        colony = result.get("colony")
+        traces = dict(colony.convergence) if colony is not None else {}
+        if result["energies"]:
+            traces["energy"] = result["energies"]
+        save_bundle(path, wsn=result["wsn"], graph=result.get("graph"), colony=colony,
+                    traces=traces, meta={"sink": result["sink"], "ch_costs":
+                                         {str(k): v for k, v in result["ch_costs"].items()}})
+        self.statusBar.showMessage(f"Hasil disimpan ke {path}")
+
+    def export_data(self):
+        if self._last_result is None:
+            return
+        path, _ = QFileDialog.getSaveFileName(
+            self, "Ekspor data simulasi", "hasil_simulasi.xlsx",
+            "Excel (*.xlsx);;CSV (*.csv);;Parquet (*.parquet)")
+        if not path:
+            return
+        try:
+            paths = export_result(self._last_result, path)
+        except ImportError as exc:
+            self.statusBar.showMessage(f"Ekspor gagal, paket belum terpasang: {exc.name}")
+            return
+        self.statusBar.showMessage(f"Data diekspor ke {', '.join(paths)}")
+
+    def export_pdf(self):
+        path, _ = QFileDialog.getSaveFileName(self, "Ekspor grafik", "grafik_simulasi.pdf", "PDF (*.pdf)")
+        if not path:
+            return
+        # rute digambar lewat blitting (animated), ikutkan saat menyimpan
+        self.route_lines.set_animated(False)
+        try:
+            save_figures_pdf(self.figures, path)
+        finally:
+            self.route_lines.set_animated(True)
+        self.statusBar.showMessage(f"Grafik diekspor ke {path}")
+
+    def closeEvent(self, event):
+        # hentikan worker sebelum jendela ditutup
+        if self.sim_thread is not None:
+            self.sim_worker.cancel()
+            self.sim_thread.quit()
+            self.sim_thread.wait()
+        super().closeEvent(event)
 
 if __name__ == "__main__":
     app = QApplication(sys.argv)
     window = WSNApp()
     # optional: start maximized on Full HD
     window.showMaximized()
-    sys.exit(app.exec_())
\ No newline at end of file
+    sys.exit(app.exec_())
@@ -0,0 +1,248 @@
+# bench.py
+"""
+Benchmark skala WSN.build_graph, HEED, AntColony._build_path dan AntColony.run,
+serta waktu startup app.py (impor + jendela pertama) di proses baru.
+
+Pemakaian:
+    python bench.py -o bench.json                      # jalankan dan simpan hasil
+    python bench.py --baseline bench_baseline.json     # bandingkan dengan baseline
+    python bench.py --save-baseline bench_baseline.json
+"""
+import argparse
+import importlib.util
+import json
+import math
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+import numpy as np
+
+from wsn import WSN
+from heed import HEED, SpatialHEED
+from aco import AntColony
+
+KEY_FIELDS = ("stage", "variant", "n", "n_ants", "n_iterations")
+
+# dijalankan di proses baru agar impor modul benar-benar diukur dari awal
+_STARTUP_SCRIPT = """
+import time
+t0 = time.perf_counter()
+import app
+t1 = time.perf_counter()
+from PyQt5.QtWidgets import QApplication
+qapp = QApplication([])
+window = app.WSNApp()
+window.show()
+qapp.processEvents()
+t2 = time.perf_counter()
+print(t1 - t0, t2 - t0)
+"""
+
+
+def _measure(fn, repeat):
+    """Waktu terbaik dari `repeat` kali pemanggilan dan puncak memori (MB)."""
+    fn()  # pemanasan: impor lazy, cache, dsb. tidak ikut diukur
+    best = math.inf
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return best, peak / 2 ** 20
+
+
+def _deployment(n, seed, area=100, degree=20):
+    """WSN dengan seed tetap dan radius yang memberi rata-rata ~degree tetangga."""
+    wsn = WSN(num_nodes=n, area_size=area, seed=seed)
+    radius = area * math.sqrt(degree / (math.pi * n))
+    return wsn, radius
+
+
+def measure_startup(repeat=3):
+    """
+    Waktu startup app.py: impor modul dan jendela pertama tampil (platform Qt
+    offscreen jika QT_QPA_PLATFORM belum diset).
+    :return: dict {"import": detik, "window": detik}, waktu terbaik; None jika
+        PyQt5 tidak terpasang
+    """
+    if importlib.util.find_spec("PyQt5") is None:
+        return None
+    env = dict(os.environ)
+    env.setdefault("QT_QPA_PLATFORM", "offscreen")
+    here = os.path.dirname(os.path.abspath(__file__))
+    best = {"import": math.inf, "window": math.inf}
+    for _ in range(repeat):
+        out = subprocess.run([sys.executable, "-c", _STARTUP_SCRIPT], cwd=here, env=env,
+                             capture_output=True, text=True, check=True).stdout
+        t_import, t_window = map(float, out.split()[-2:])
+        best["import"] = min(best["import"], t_import)
+        best["window"] = min(best["window"], t_window)
+    return best
+
+
+def run_benchmarks(sizes=(50, 200, 1000, 5000), ants=(10, 50), iterations=(10,),
+                   max_dense=1000, max_python=50, repeat=3, seed=0, startup=True, log=None):
+    """
+    Jalankan seluruh benchmark.
+    :param sizes: daftar jumlah node N
+    :param ants: daftar jumlah semut
+    :param iterations: daftar jumlah iterasi untuk AntColony.run
+    :param max_dense: N maksimum untuk graph lengkap (O(N^2) memori)
+    :param max_python: N maksimum untuk AntColony.run engine "python" (lambat)
+    :param repeat: jumlah pengulangan, diambil waktu terbaik
+    :param startup: ukur juga waktu startup app.py (lihat measure_startup)
+    :param log: fungsi cetak progres opsional
+    :return: list dict hasil
+    """
+    results = []
+
+    def record(stage, variant, n, fn, n_ants=0, n_iterations=0):
+        seconds, peak = _measure(fn, repeat)
+        row = {"stage": stage, "variant": variant, "n": n, "n_ants": n_ants,
+               "n_iterations": n_iterations, "seconds": seconds, "peak_mb": peak}
+        results.append(row)
+        if log is not None:
+            log(f"{stage:<12} {variant:<12} N={n:<6} ants={n_ants:<4} it={n_iterations:<4} "
+                f"{seconds * 1e3:10.2f} ms {peak:9.2f} MB")
+
+    for n in sizes:
+        wsn, radius = _deployment(n, seed)
+        end = n - 1
+
+        # --- build_graph ---
+        if n <= max_dense:
+            record("build_graph", "complete", n, lambda: wsn.build_graph())
+        record("build_graph", "radius_csr", n, lambda: wsn.build_graph(radius=radius, fmt="csr"))
+        csr = wsn.build_graph(radius=radius, fmt="csr")
+        dense = wsn.build_graph() if n <= max_dense else None
+
+        # --- HEED ---
+        wsn.energy = np.random.default_rng(seed).random(n)  # energi bervariasi
+        record("heed", "simple", n, lambda: HEED(wsn, seed=seed).select_cluster_heads())
+        record("heed", "iterative", n,
+               lambda: HEED(wsn, graph=csr, seed=seed).select_cluster_heads_iterative())
+        record("heed", "spatial", n,
+               lambda: SpatialHEED(wsn, radius, graph=csr, seed=seed).select_cluster_heads())
+
+        # --- konstruksi jalur ---
+        if dense is not None:
+            colony = AntColony(dense, 1, 1, 0.5)
+            record("build_path", "python", n, lambda: colony._build_path(0, end), n_ants=1)
+        for a in ants:
+            variants = [("numpy_csr", csr)] + ([("numpy_dense", dense)] if dense is not None else [])
+            for variant, graph in variants:
+                colony = AntColony(graph, a, 1, 0.5, engine="numpy", seed=seed)
+                colony._snapshot()
+                record("build_path", variant, n, lambda: colony._build_paths(0, end), n_ants=a)
+
+        # --- run lengkap ---
+        for a in ants:
+            for it in iterations:
+                if dense is not None and n <= max_python:
+                    record("run", "python", n,
+                           lambda: AntColony(dense, a, it, 0.5).run(0, end),
+                           n_ants=a, n_iterations=it)
+                record("run", "numpy_csr", n,
+                       lambda: AntColony(csr, a, it, 0.5, engine="numpy", seed=seed).run(0, end),
+                       n_ants=a, n_iterations=it)
+                if dense is not None:
+                    record("run", "numpy_dense", n,
+                           lambda: AntColony(dense, a, it, 0.5, engine="numpy", seed=seed).run(0, end),
+                           n_ants=a, n_iterations=it)
+
+    if startup:
+        times = measure_startup(repeat)
+        if times is None and log is not None:
+            log("startup      dilewati (PyQt5 tidak terpasang)")
+        for variant, seconds in (times or {}).items():
+            results.append({"stage": "startup", "variant": variant, "n": 0, "n_ants": 0,
+                            "n_iterations": 0, "seconds": seconds, "peak_mb": 0.0})
+            if log is not None:
+                log(f"{'startup':<12} {variant:<12} {seconds * 1e3:10.2f} ms")
+    return results
+
+
+def compare(results, baseline, tolerance=0.25, min_seconds=1e-3):
+    """
+    Bandingkan hasil dengan baseline.
+    :param tolerance: batas perlambatan relatif (0.25 = 25% lebih lambat)
+    :param min_seconds: selisih absolut minimum agar dianggap regresi (abaikan noise)
+    :return: list (row, rasio) untuk setiap regresi
+    """
+    base = {tuple(r[k] for k in KEY_FIELDS): r for r in baseline}
+    regressions = []
+    for row in results:
+        ref = base.get(tuple(row[k] for k in KEY_FIELDS))
+        if ref is None or ref["seconds"] <= 0:
+            continue
+        ratio = row["seconds"] / ref["seconds"]
+        if ratio > 1 + tolerance and row["seconds"] - ref["seconds"] > min_seconds:
+            regressions.append((row, ratio))
+    return regressions
+
+
+def _document(results, args):
+    return {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "seed": args.seed,
+            "repeat": args.repeat,
+        },
+        "results": results,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark skala WSN/HEED/ACO")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[50, 200, 1000, 5000])
+    parser.add_argument("--ants", type=int, nargs="+", default=[10, 50])
+    parser.add_argument("--iterations", type=int, nargs="+", default=[10])
+    parser.add_argument("--max-dense", type=int, default=1000)
+    parser.add_argument("--max-python", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--no-startup", action="store_true", help="lewati benchmark startup app.py")
+    parser.add_argument("-o", "--output", help="simpan hasil (JSON)")
+    parser.add_argument("--baseline", help="file baseline untuk deteksi regresi")
+    parser.add_argument("--save-baseline", help="simpan hasil sebagai baseline baru")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(args.sizes, args.ants, args.iterations, args.max_dense,
+                             args.max_python, args.repeat, args.seed,
+                             startup=not args.no_startup, log=print)
+    document = _document(results, args)
+    for path in (args.output, args.save_baseline):
+        if path:
+            with open(path, "w") as f:
+                json.dump(document, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)["results"]
+        regressions = compare(results, baseline, args.tolerance)
+        for row, ratio in regressions:
+            print(f"REGRESI {row['stage']} {row['variant']} N={row['n']} ants={row['n_ants']} "
+                  f"it={row['n_iterations']}: {ratio:.2f}x lebih lambat")
+        if regressions:
+            return 1
+        print("Tidak ada regresi terhadap baseline")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,203 @@
+# bundle.py
+"""
+Format bundle di disk: satu direktori berisi file .npy per array dan
+meta.json untuk parameter. Array dimuat dengan memory mapping (zero-copy),
+sehingga deployment/run besar bisa dibuka ulang, diperiksa dan dilanjutkan
+tanpa simulasi ulang.
+
+    save_bundle("run1", wsn=wsn, graph=graph, colony=aco, simulator=sim)
+    b = load_bundle("run1")
+    wsn = b.wsn()
+    aco = b.colony(writable=True)   # feromon di-update langsung di file
+    aco.run(0, wsn.num_nodes - 1, n_iterations=20)
+
+Isi direktori:
+    meta.json                     parameter + daftar array
+    pos.npy energy.npy clusters.npy
+    graph_indptr.npy graph_indices.npy graph_weights.npy
+    colony_pheromone.npy colony_distance.npy colony_neighbors.npy colony_dead.npy
+    trace_<nama>.npy              jejak per round/iterasi
+"""
+import json
+import os
+
+import numpy as np
+
+from wsn import WSN
+from graph import CSRGraph
+from aco import AntColony
+from lifetime import LifetimeSimulator
+
+FORMAT = "wsn-bundle"
+VERSION = 1
+
+# parameter AntColony (hasil _state) yang disimpan di meta.json
+_COLONY_PARAMS = ("n_ants", "decay", "alpha", "beta", "candidates", "deposit",
+                  "elite_weight", "rank_size", "patience", "min_branching",
+                  "min_entropy", "time_limit", "variant", "q0", "local_decay",
+                  "p_best", "restart_after", "tau0", "tau_min", "tau_max",
+                  "_best_cost", "_min_scale", "num_nodes")
+# nilai untuk parameter yang belum ada di bundle lama (Ant System biasa)
+_COLONY_DEFAULTS = {"variant": "as", "q0": 0.0, "local_decay": 0.1, "p_best": 0.05,
+                    "restart_after": None, "tau0": None, "tau_min": None, "tau_max": None,
+                    "_best_cost": float("inf")}
+
+
+def _scalar(value):
+    """Nilai NumPy -> tipe Python agar bisa ditulis ke JSON."""
+    return value.item() if isinstance(value, np.generic) else value
+
+
+def save_bundle(path, wsn=None, graph=None, colony=None, simulator=None, traces=None, meta=None):
+    """
+    Simpan deployment dan hasil run ke direktori bundle.
+    :param wsn: WSN (posisi, energi, cluster); None = simulator.wsn jika ada
+    :param graph: CSRGraph atau graph NetworkX (disimpan sebagai CSR)
+    :param colony: AntColony engine "numpy" (feromon + snapshot graph)
+    :param simulator: LifetimeSimulator (status round + riwayat)
+    :param traces: dict {nama: array} jejak tambahan, mis. aco.convergence
+    :param meta: dict metadata bebas (harus bisa ditulis ke JSON)
+    """
+    os.makedirs(path, exist_ok=True)
+    arrays = {}
+    info = {"format": FORMAT, "version": VERSION, "user": meta or {}}
+
+    if wsn is None and simulator is not None:
+        wsn = simulator.wsn
+    if wsn is not None:
+        info["wsn"] = {"num_nodes": wsn.num_nodes, "area_size": _scalar(wsn.area_size),
+                       "init_energy": _scalar(wsn.init_energy),
+                       "cluster_heads": [int(c) for c in getattr(wsn, "cluster_heads", [])]}
+        arrays.update(pos=wsn.pos, energy=wsn.energy, clusters=wsn.clusters)
+
+    if graph is not None:
+        if not isinstance(graph, CSRGraph):
+            graph = CSRGraph.from_networkx(graph)
+        arrays.update(graph_indptr=graph.indptr, graph_indices=graph.indices,
+                      graph_weights=graph.weights)
+
+    if colony is not None:
+        if colony.engine != "numpy":
+            raise ValueError("hanya AntColony engine 'numpy' yang bisa disimpan")
+        colony._flush_pheromone()
+        state = colony._state()
+        info["colony"] = {k: _scalar(state[k]) for k in _COLONY_PARAMS}
+        info["colony"]["dtype"] = np.dtype(state["dtype"]).str
+        info["colony"]["n_iterations"] = colony.n_iterations
+        arrays.update(colony_pheromone=colony.pheromone, colony_distance=state["distance"],
+                      colony_dead=state["dead"])
+        if state["neighbors"] is not None:
+            arrays["colony_neighbors"] = state["neighbors"]
+
+    if simulator is not None:
+        info["lifetime"] = {"rounds": simulator.rounds, "fnd": simulator.fnd,
+                            "hnd": simulator.hnd, "lnd": simulator.lnd,
+                            "sink": simulator.sink.tolist()}
+        arrays.update(trace_alive=np.asarray(simulator.alive_history, dtype=np.int64),
+                      trace_energy=np.asarray(simulator.energy_history, dtype=float),
+                      trace_ch=np.asarray(simulator.ch_history, dtype=np.int64))
+
+    for name, values in (traces or {}).items():
+        arrays[f"trace_{name}"] = np.asarray(values)
+
+    for name, array in arrays.items():
+        np.save(os.path.join(path, name + ".npy"), np.ascontiguousarray(array))
+    info["arrays"] = sorted(arrays)
+
+    # meta.json ditulis terakhir: bundle tanpa meta dianggap belum lengkap
+    tmp = os.path.join(path, "meta.json.tmp")
+    with open(tmp, "w") as f:
+        json.dump(info, f, indent=2)
+    os.replace(tmp, os.path.join(path, "meta.json"))
+
+
+class Bundle:
+    def __init__(self, path, mmap_mode="r"):
+        """
+        Buka bundle hasil save_bundle
+        :param mmap_mode: mode memory map np.load ("r", "r+", "c"); None = muat ke RAM
+        """
+        with open(os.path.join(path, "meta.json")) as f:
+            self.meta = json.load(f)
+        if self.meta.get("format") != FORMAT:
+            raise ValueError(f"{path} bukan bundle WSN")
+        if self.meta["version"] > VERSION:
+            raise ValueError(f"versi bundle {self.meta['version']} tidak didukung")
+        self.path = path
+        self.mmap_mode = mmap_mode
+
+    def __contains__(self, name):
+        return name in self.meta["arrays"]
+
+    def array(self, name, mmap_mode=None):
+        """Muat satu array (memory-mapped sesuai mmap_mode bundle)."""
+        if name not in self:
+            raise KeyError(f"array {name!r} tidak ada di bundle")
+        mode = mmap_mode if mmap_mode is not None else self.mmap_mode
+        return np.load(os.path.join(self.path, name + ".npy"), mmap_mode=mode)
+
+    @property
+    def traces(self):
+        """dict {nama: array} semua jejak yang tersimpan."""
+        return {name[len("trace_"):]: self.array(name)
+                for name in self.meta["arrays"] if name.startswith("trace_")}
+
+    def wsn(self):
+        """WSN dengan posisi memory-mapped; energi dan cluster disalin ke RAM."""
+        info = self.meta["wsn"]
+        wsn = WSN(info["num_nodes"], area_size=info["area_size"],
+                  init_energy=info["init_energy"], pos=self.array("pos"))
+        wsn.energy = np.array(self.array("energy"))
+        wsn.clusters = np.array(self.array("clusters"))
+        wsn.cluster_heads = list(info["cluster_heads"])
+        return wsn
+
+    def graph(self):
+        """CSRGraph zero-copy di atas array memory-mapped."""
+        return CSRGraph(self.array("graph_indptr"), self.array("graph_indices"),
+                        self.array("graph_weights"))
+
+    def colony(self, seed=None, writable=False):
+        """
+        AntColony engine "numpy" dengan feromon tersimpan (warm start).
+        :param writable: feromon dipetakan "r+" sehingga run() memperbarui
+            file secara langsung; False = disalin ke RAM
+        """
+        info = dict(self.meta["colony"])
+        state = {k: info[k] if k in info else _COLONY_DEFAULTS[k] for k in _COLONY_PARAMS}
+        state["dtype"] = np.dtype(info["dtype"])
+        state["distance"] = self.array("colony_distance")
+        state["neighbors"] = self.array("colony_neighbors") if "colony_neighbors" in self else None
+        state["dead"] = np.array(self.array("colony_dead"))
+        state["heuristic"] = None  # dihitung ulang dari jarak saat run pertama
+
+        if writable:
+            pheromone = self.array("colony_pheromone", mmap_mode="r+")
+        else:
+            pheromone = np.array(self.array("colony_pheromone"))
+        colony = AntColony._from_state(state, pheromone, seed)
+        colony.n_iterations = info["n_iterations"]
+        colony._reset_convergence()
+        if "graph_indptr" in self:
+            colony.graph = self.graph()
+        return colony
+
+    def lifetime(self, **kwargs):
+        """
+        Lanjutkan LifetimeSimulator dari status tersimpan. RNG HEED tidak
+        ikut disimpan, jadi round berikutnya memakai seed dari kwargs.
+        :param kwargs: argumen LifetimeSimulator selain wsn dan sink
+        """
+        info = self.meta["lifetime"]
+        sim = LifetimeSimulator(self.wsn(), sink=info["sink"], **kwargs)
+        sim.rounds = info["rounds"]
+        sim.fnd, sim.hnd, sim.lnd = info["fnd"], info["hnd"], info["lnd"]
+        sim.alive_history = self.array("trace_alive").tolist()
+        sim.energy_history = self.array("trace_energy").tolist()
+        sim.ch_history = self.array("trace_ch").tolist()
+        return sim
+
+
+def load_bundle(path, mmap_mode="r"):
+    """Buka bundle di `path`; lihat Bundle."""
+    return Bundle(path, mmap_mode=mmap_mode)
@@ -0,0 +1,172 @@
+# cache.py
+"""
+Cache topologi per deployment: graph, matriks jarak dan hasil HEED disimpan
+dengan kunci hash posisi node + parameter, sehingga run berulang pada
+deployment yang sama (mis. hanya n_ants/n_iterations yang berubah) tidak
+mengulang setup O(N^2).
+
+Objek yang dikembalikan dipakai bersama antar run: array dibuat read-only,
+dan graph NetworkX jangan diubah (AntColony.update_weights hanya mengubah
+snapshot koloni, bukan graph).
+
+    wsn = WSN(100, seed=42)
+    graph = cache.build_graph(wsn)
+    distance = cache.distance_matrix(wsn)
+    ch = cache.select_cluster_heads(wsn, seed=42)
+
+Direktori disk opsional diambil dari variabel lingkungan WSN_CACHE_DIR.
+"""
+import hashlib
+import os
+import pickle
+import tempfile
+from collections import OrderedDict
+
+import numpy as np
+
+from graph import dense_distance
+from heed import HEED
+
+
+class TopologyCache:
+    def __init__(self, maxsize=16, directory=None):
+        """
+        Cache LRU di memori dengan penyimpanan disk opsional
+        :param maxsize: jumlah entri maksimum di memori
+        :param directory: direktori file pickle; None = hanya memori
+        """
+        self.maxsize = maxsize
+        self.directory = directory
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries or (self.directory is not None
+                                        and os.path.exists(self._path(key)))
+
+    def _path(self, key):
+        name = hashlib.sha1(key.encode()).hexdigest()
+        return os.path.join(self.directory, name + ".pkl")
+
+    def get(self, key, default=None):
+        if key in self._entries:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return self._entries[key]
+
+        if self.directory is not None:
+            try:
+                with open(self._path(key), "rb") as f:
+                    value = pickle.load(f)
+            except (OSError, pickle.UnpicklingError, EOFError):
+                pass
+            else:
+                self.hits += 1
+                self._store(key, value)
+                return value
+
+        self.misses += 1
+        return default
+
+    def put(self, key, value):
+        self._store(key, value)
+        if self.directory is not None:
+            # tulis ke file sementara lalu rename agar tidak terbaca setengah jadi
+            fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+                os.replace(tmp, self._path(key))
+            except BaseException:
+                os.unlink(tmp)
+                raise
+
+    def _store(self, key, value):
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def get_or_compute(self, key, compute):
+        """Ambil nilai `key`, atau hitung dengan compute() lalu simpan."""
+        missing = object()
+        value = self.get(key, missing)
+        if value is missing:
+            value = compute()
+            self.put(key, value)
+        return value
+
+    def clear(self):
+        """Kosongkan cache memori (file di disk tidak dihapus)."""
+        self._entries.clear()
+
+
+_default = None
+
+
+def default_cache():
+    """Cache global proses ini (disk: WSN_CACHE_DIR jika diset)."""
+    global _default
+    if _default is None:
+        _default = TopologyCache(directory=os.environ.get("WSN_CACHE_DIR") or None)
+    return _default
+
+
+def _readonly(array):
+    array.setflags(write=False)
+    return array
+
+
+def build_graph(wsn, radius=None, fmt="networkx", cache=None):
+    """WSN.build_graph dengan cache. :param cache: TopologyCache; None = default_cache()"""
+    cache = cache if cache is not None else default_cache()
+    key = f"{wsn.key()}:graph:{radius}:{fmt}"
+    return cache.get_or_compute(key, lambda: wsn.build_graph(radius=radius, fmt=fmt))
+
+
+def distance_matrix(wsn, radius=None, cache=None):
+    """
+    Matriks jarak padat (inf untuk pasangan di luar jangkauan dan diagonal),
+    sama dengan snapshot AntColony; bisa diberikan ke AntColony(distance=...).
+    """
+    cache = cache if cache is not None else default_cache()
+    key = f"{wsn.key()}:distance:{radius}"
+
+    def compute():
+        graph = build_graph(wsn, radius=radius, cache=cache)
+        return dense_distance(graph, wsn.num_nodes)
+
+    return _readonly(cache.get_or_compute(key, compute))
+
+
+def select_cluster_heads(wsn, p=0.05, seed=None, radius=None, iterative=False, cache=None):
+    """
+    Clustering HEED dengan cache; mengisi wsn.cluster_heads dan wsn.clusters.
+    Tanpa seed hasil HEED acak sehingga tidak di-cache.
+    :param radius: jangkauan radio untuk HEED (graph CSR, lihat HEED)
+    :param iterative: pakai select_cluster_heads_iterative()
+    :return: daftar CH
+    """
+    cache = cache if cache is not None else default_cache()
+    graph = build_graph(wsn, radius=radius, fmt="csr", cache=cache) if radius is not None else None
+
+    def compute():
+        heed = HEED(wsn, p=p, graph=graph, seed=seed)
+        ch = heed.select_cluster_heads_iterative() if iterative else heed.select_cluster_heads()
+        return list(ch), _readonly(np.array(wsn.clusters))
+
+    if seed is None:
+        return compute()[0]
+
+    energy = hashlib.sha1(np.ascontiguousarray(wsn.energy, dtype=float).tobytes()).hexdigest()
+    key = f"{wsn.key()}:heed:{p}:{seed}:{radius}:{iterative}:{energy}"
+    ch, clusters = cache.get_or_compute(key, compute)
+    wsn.cluster_heads = list(ch)
+    wsn.clusters = clusters.copy()
+    return wsn.cluster_heads
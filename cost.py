@@ -0,0 +1,160 @@
+# cost.py
+"""
+Biaya edge routing sadar-energi: gabungan jarak, energi residual dan jumlah
+hop dengan bobot yang bisa diatur,
+
+    cost(u, v) = w_distance * d(u, v) + d_ref * (w_energy * penalti + w_hop)
+
+dengan penalti = E0 / E - 1 (0 saat energi penuh, membesar saat energi
+habis). d_ref (rata-rata panjang edge) membuat ketiga suku berskala sama,
+sehingga dengan w_energy = w_hop = 0 biaya sama dengan jarak.
+
+EdgeCostModel menyimpan biaya semua edge dan saat WSN.energy berubah hanya
+menghitung ulang edge yang bersisian dengan node yang berubah:
+
+    model = EdgeCostModel(wsn, graph, w_energy=1.0, w_hop=0.5)
+    aco = AntColony(model.graph(), ..., engine="numpy")
+    ...                                  # energi berkurang selama round
+    model.apply(aco)                     # update_weights untuk edge berubah
+"""
+import numpy as np
+
+from graph import CSRGraph
+
+
+def energy_penalty(energy, init_energy, floor=1e-3):
+    """
+    Penalti energi residual E0 / E - 1. Energi dibatasi bawah floor * E0
+    agar biaya tetap hingga (node mati sebaiknya ditandai lewat
+    AntColony.remove_nodes).
+    """
+    energy = np.maximum(np.asarray(energy, dtype=float), floor * init_energy)
+    return init_energy / energy - 1.0
+
+
+class EdgeCostModel:
+    def __init__(self, wsn, graph, w_distance=1.0, w_energy=1.0, w_hop=0.0, floor=1e-3):
+        """
+        :param wsn: objek WSN (sumber energi node)
+        :param graph: graph jarak dari WSN.build_graph (NetworkX atau CSRGraph)
+        :param w_distance: bobot suku jarak
+        :param w_energy: bobot penalti energi; penalti edge = rata-rata
+            penalti kedua ujungnya (graph tetap tak berarah)
+        :param w_hop: bobot biaya tetap per hop
+        :param floor: batas bawah energi relatif untuk penalti
+        """
+        if not isinstance(graph, CSRGraph):
+            graph = CSRGraph.from_networkx(graph)
+        self.wsn = wsn
+        self.w_distance = w_distance
+        self.w_energy = w_energy
+        self.w_hop = w_hop
+        self.floor = floor
+
+        self.indptr = graph.indptr
+        self.indices = graph.indices
+        self.rows = graph.rows
+        self.distance = graph.weights
+        self.d_ref = float(self.distance.mean()) if len(self.distance) else 1.0
+
+        # posisi entri (v, u) untuk tiap entri (u, v), agar kedua arah sama
+        order = np.lexsort((self.indices, self.rows))
+        reverse = np.lexsort((self.rows, self.indices))
+        self._reverse = np.empty(len(order), dtype=np.intp)
+        self._reverse[order] = reverse
+
+        self._energy = np.array(wsn.energy, dtype=float)
+        self._penalty = energy_penalty(self._energy, wsn.init_energy, floor)
+        self.weights = self._cost(np.arange(len(self.indices)))
+
+    def _cost(self, entries):
+        """Biaya komposit untuk entri CSR `entries`."""
+        u, v = self.rows[entries], self.indices[entries]
+        penalty = 0.5 * (self._penalty[u] + self._penalty[v])
+        return (self.w_distance * self.distance[entries]
+                + self.d_ref * (self.w_energy * penalty + self.w_hop))
+
+    def graph(self):
+        """CSRGraph berisi biaya saat ini (untuk AntColony engine "numpy")."""
+        return CSRGraph(self.indptr, self.indices, self.weights.copy())
+
+    def edges(self, entries=None):
+        """
+        Edge (u, v, cost) dengan u < v sebagai array (m, 3), format
+        AntColony.update_weights. :param entries: entri CSR; None = semua
+        """
+        if entries is None:
+            entries = np.arange(len(self.indices))
+        u, v = self.rows[entries], self.indices[entries]
+        upper = u < v
+        return np.column_stack([u[upper], v[upper], self.weights[entries[upper]]])
+
+    def update(self, energy=None):
+        """
+        Hitung ulang biaya edge yang bersisian dengan node yang energinya
+        berubah sejak update terakhir; biaya O(jumlah derajat node berubah).
+        :param energy: energi node; None = wsn.energy
+        :return: array (m, 3) edge (u, v, cost) yang berubah
+        """
+        energy = self.wsn.energy if energy is None else np.asarray(energy, dtype=float)
+        changed = np.flatnonzero(energy != self._energy)
+        if not len(changed):
+            return np.empty((0, 3))
+        self._energy[changed] = energy[changed]
+        self._penalty[changed] = energy_penalty(energy[changed], self.wsn.init_energy, self.floor)
+
+        # entri CSR pada baris node yang berubah (rentang indptr digabung)
+        start, stop = self.indptr[changed], self.indptr[changed + 1]
+        length = stop - start
+        offset = np.repeat(start - np.cumsum(length) + length, length)
+        entries = offset + np.arange(length.sum())
+
+        cost = self._cost(entries)
+        self.weights[entries] = cost
+        self.weights[self._reverse[entries]] = cost
+
+        # edge antar dua node berubah muncul dua kali, simpan satu arah saja
+        u, v = self.rows[entries], self.indices[entries]
+        is_changed = np.zeros(len(self._energy), dtype=bool)
+        is_changed[changed] = True
+        keep = ~is_changed[v] | (u < v)
+        return np.column_stack([u[keep], v[keep], cost[keep]])
+
+    def apply(self, colony, energy=None):
+        """update() lalu terapkan edge yang berubah ke AntColony. :return: jumlah edge"""
+        edges = self.update(energy)
+        colony.update_weights(edges)
+        return len(edges)
+
+
+class EnergyAwareRouter:
+    def __init__(self, wsn, w_distance=1.0, w_energy=1.0, w_hop=0.0, floor=1e-3):
+        """
+        Router LifetimeSimulator (pengganti greedy_route): tiap CH memilih
+        next hop dengan biaya komposit terkecil di antara CH yang lebih dekat
+        ke sink dan sink itu sendiri. Penalti energi milik penerima (sink
+        tanpa penalti). Dengan w_energy = w_hop = 0 hasilnya sama dengan
+        greedy_route.
+        """
+        self.wsn = wsn
+        self.w_distance = w_distance
+        self.w_energy = w_energy
+        self.w_hop = w_hop
+        self.floor = floor
+
+    def __call__(self, pos, ch, sink):
+        ch_pos = pos[ch]
+        to_sink = np.linalg.norm(ch_pos - sink, axis=1)
+        d = np.linalg.norm(ch_pos[:, None, :] - ch_pos[None, :, :], axis=2)
+        forward = to_sink[None, :] < to_sink[:, None]  # hanya maju ke arah sink
+        d_ref = float(to_sink.mean()) if len(ch) else 1.0
+
+        penalty = energy_penalty(self.wsn.energy[ch], self.wsn.init_energy, self.floor)
+        cost = self.w_distance * d + d_ref * (self.w_energy * penalty[None, :] + self.w_hop)
+        cost[~forward] = np.inf
+        direct = self.w_distance * to_sink + d_ref * self.w_hop
+
+        parent = np.argmin(cost, axis=1)
+        hop = cost[np.arange(len(ch)), parent]
+        parent[hop >= direct] = -1
+        return parent
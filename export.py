@@ -0,0 +1,339 @@
+# export.py
+"""
+Ekspor hasil simulasi secara streaming ke CSV, Parquet atau Excel (.xlsx),
+dan grafik ke PDF multi-halaman. Baris ditulis segera (CSV), per chunk
+(Parquet) atau lewat openpyxl write-only (Excel), sehingga memori tidak
+bertambah seiring panjang run.
+
+Tabel:
+    rounds       round, node hidup, energi rata-rata, CH
+    routes       next hop tiap node pada rute (CH -> sink) dan biayanya
+    node_energy  energi tiap node per round (opsional, besar)
+    summary      pasangan key/value ringkasan
+
+Pemakaian headless (simulasi umur jaringan):
+    python export.py --nodes 200 --seed 1 -o hasil.xlsx --pdf grafik.pdf
+"""
+import argparse
+import csv
+import os
+import sys
+
+import numpy as np
+
+TABLES = {
+    "rounds": ["round", "alive", "mean_energy", "n_cluster_heads", "cluster_heads"],
+    "routes": ["round", "node", "next_hop", "cost"],
+    "node_energy": ["round", "node", "energy"],
+    "summary": ["key", "value"],
+}
+# kolom bertipe teks (Parquet); kolom lain disimpan float64
+STRING_COLUMNS = {"cluster_heads", "key", "value", "error", "variant"}
+FORMATS = ("csv", "parquet", "xlsx")
+
+
+def _cell(value):
+    """Nilai sel: skalar NumPy -> Python, list/array -> teks dipisah spasi."""
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, (list, tuple, np.ndarray)):
+        return " ".join(str(v) for v in np.asarray(value).tolist())
+    return value
+
+
+def guess_format(path):
+    ext = os.path.splitext(path)[1].lower().lstrip(".")
+    return ext if ext in FORMATS else "csv"
+
+
+class CSVSink:
+    def __init__(self, path, columns):
+        self.columns = columns
+        self.file = open(path, "w", newline="")
+        self.writer = csv.writer(self.file)
+        self.writer.writerow(columns)
+
+    def write(self, row):
+        self.writer.writerow([_cell(row.get(c)) for c in self.columns])
+
+    def flush(self):
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+
+class ParquetSink:
+    def __init__(self, path, columns, chunk_size=1024):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        self.pa = pa
+        self.columns = columns
+        self.schema = pa.schema([(c, pa.string() if c in STRING_COLUMNS else pa.float64())
+                                 for c in columns])
+        self.writer = pq.ParquetWriter(path, self.schema)
+        self.chunk_size = chunk_size
+        self.rows = []
+
+    def write(self, row):
+        self.rows.append(row)
+        if len(self.rows) >= self.chunk_size:
+            self.flush()
+
+    def flush(self):
+        if not self.rows:
+            return
+        columns = {}
+        for c in self.columns:
+            values = [_cell(r.get(c)) for r in self.rows]
+            if c in STRING_COLUMNS:
+                values = [None if v is None else str(v) for v in values]
+            else:
+                values = [None if v is None else float(v) for v in values]
+            columns[c] = values
+        self.writer.write_table(self.pa.table(columns, schema=self.schema))
+        self.rows = []
+
+    def close(self):
+        self.flush()
+        self.writer.close()
+
+
+class XLSXSink:
+    def __init__(self, path, columns, title="hasil", workbook=None):
+        """
+        Satu sheet Excel mode write-only (baris langsung ditulis ke file sementara)
+        :param workbook: workbook bersama; None = buat sendiri dan simpan ke path saat close
+        """
+        self.owner = workbook is None
+        if self.owner:
+            from openpyxl import Workbook
+            workbook = Workbook(write_only=True)
+        self.workbook = workbook
+        self.path = path
+        self.columns = columns
+        self.sheet = workbook.create_sheet(title)
+        self.sheet.append(columns)
+
+    def write(self, row):
+        self.sheet.append([_cell(row.get(c)) for c in self.columns])
+
+    def flush(self):
+        pass
+
+    def close(self):
+        if self.owner:
+            self.workbook.save(self.path)
+
+
+def open_sink(path, columns, fmt=None):
+    """Sink satu tabel sesuai format ("csv", "parquet", "xlsx"; None = dari ekstensi)."""
+    fmt = fmt or guess_format(path)
+    if fmt == "csv":
+        return CSVSink(path, columns)
+    if fmt == "parquet":
+        return ParquetSink(path, columns)
+    if fmt == "xlsx":
+        return XLSXSink(path, columns)
+    raise ValueError(f"format output tidak dikenal: {fmt!r}")
+
+
+class ResultExporter:
+    def __init__(self, path, tables=("rounds", "routes", "summary"), fmt=None):
+        """
+        Ekspor beberapa tabel sekaligus. Excel: satu workbook, satu sheet per
+        tabel. CSV/Parquet: satu file per tabel, <nama>_<tabel>.<ext>.
+        :param tables: nama tabel dari TABLES yang ditulis
+        """
+        self.fmt = fmt or guess_format(path)
+        if self.fmt not in FORMATS:
+            raise ValueError(f"format output tidak dikenal: {self.fmt!r}")
+        self.path = path
+        self.paths = []
+        self.sinks = {}
+        self.workbook = None
+
+        if self.fmt == "xlsx":
+            from openpyxl import Workbook
+            self.workbook = Workbook(write_only=True)
+            for name in tables:
+                self.sinks[name] = XLSXSink(path, TABLES[name], title=name, workbook=self.workbook)
+            self.paths.append(path)
+        else:
+            stem = os.path.splitext(path)[0]
+            for name in tables:
+                table_path = f"{stem}_{name}.{self.fmt}"
+                self.sinks[name] = open_sink(table_path, TABLES[name], self.fmt)
+                self.paths.append(table_path)
+
+    def write(self, table, row):
+        self.sinks[table].write(row)
+
+    def write_rows(self, table, rows):
+        sink = self.sinks[table]
+        for row in rows:
+            sink.write(row)
+
+    def flush(self):
+        for sink in self.sinks.values():
+            sink.flush()
+
+    def close(self):
+        for sink in self.sinks.values():
+            sink.close()
+        if self.workbook is not None:
+            self.workbook.save(self.path)
+            self.workbook = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def write_round(exporter, sim, node_energy=False):
+    """Tulis status satu round LifetimeSimulator (dipakai sebagai on_round)."""
+    wsn, r = sim.wsn, sim.rounds
+    ch, parent = sim.cluster_heads, sim.parent
+    exporter.write("rounds", {"round": r, "alive": sim.alive_history[-1],
+                              "mean_energy": sim.energy_history[-1],
+                              "n_cluster_heads": len(ch), "cluster_heads": ch})
+    if "routes" in exporter.sinks and len(ch):
+        next_pos = np.where(parent[:, None] >= 0, wsn.pos[ch[np.maximum(parent, 0)]], sim.sink)
+        cost = np.linalg.norm(wsn.pos[ch] - next_pos, axis=1)
+        next_hop = np.where(parent >= 0, ch[np.maximum(parent, 0)], -1)  # -1 = sink
+        exporter.write_rows("routes", ({"round": r, "node": u, "next_hop": v, "cost": c}
+                                       for u, v, c in zip(ch.tolist(), next_hop.tolist(),
+                                                          cost.tolist())))
+    if node_energy and "node_energy" in exporter.sinks:
+        exporter.write_rows("node_energy", ({"round": r, "node": i, "energy": e}
+                                            for i, e in enumerate(wsn.energy.tolist())))
+
+
+def export_lifetime(sim, exporter, max_rounds=10000, stop="LND", node_energy=False):
+    """
+    Jalankan LifetimeSimulator sambil menulis tiap round ke exporter.
+    :return: hasil sim.run(); ringkasan juga ditulis ke tabel "summary"
+    """
+    result = sim.run(max_rounds=max_rounds, stop=stop,
+                     on_round=lambda s: write_round(exporter, s, node_energy))
+    if "summary" in exporter.sinks:
+        exporter.write_rows("summary", ({"key": k, "value": v} for k, v in result.items()))
+    return result
+
+
+def export_result(result, path, fmt=None):
+    """
+    Ekspor hasil satu simulasi GUI (dict dari SimulationWorker).
+    :return: daftar file yang ditulis
+    """
+    wsn, tree = result["wsn"], result["tree"]
+    with ResultExporter(path, fmt=fmt) as exporter:
+        energies = result["energies"]
+        exporter.write_rows("rounds", ({"round": r + 1, "mean_energy": e,
+                                        "n_cluster_heads": len(result["ch"]),
+                                        "cluster_heads": result["ch"]}
+                                       for r, e in enumerate(energies)))
+        costs = result["ch_costs"]
+        exporter.write_rows("routes", ({"round": 0, "node": u, "next_hop": v,
+                                        "cost": costs.get(u)} for u, v in tree.items()))
+        summary = {"num_nodes": wsn.num_nodes, "area_size": wsn.area_size,
+                   "sink": result["sink"], "n_cluster_heads": len(result["ch"]),
+                   "total_cost": result["best_cost"], "cancelled": result["cancelled"]}
+        if "iterations" in result:
+            summary.update(iterations=result["iterations"], stop_reason=result["stop_reason"])
+        exporter.write_rows("summary", ({"key": k, "value": v} for k, v in summary.items()))
+    return exporter.paths
+
+
+def save_figures_pdf(figures, path):
+    """Simpan figure matplotlib ke satu PDF, satu halaman per figure."""
+    from matplotlib.backends.backend_pdf import PdfPages
+
+    with PdfPages(path) as pdf:
+        for fig in figures:
+            pdf.savefig(fig)
+
+
+def render_figures(wsn, segments=None, sink=None, energies=None):
+    """
+    Buat empat figure (topologi, cluster, routing, energi) tanpa pyplot,
+    untuk ekspor PDF headless.
+    :param segments: segmen rute (k, 2, 2), mis. wsn.tree_segments(tree)
+    :param sink: koordinat sink (x, y)
+    :param energies: energi rata-rata per round
+    """
+    from matplotlib.figure import Figure
+    from matplotlib.collections import LineCollection
+
+    figures = [Figure(figsize=(6, 4)) for _ in range(4)]
+    axes = [fig.add_subplot(111) for fig in figures]
+
+    axes[0].scatter(wsn.pos[:, 0], wsn.pos[:, 1], c="#2b7cff", s=12)
+    axes[0].set_title("Topologi Awal")
+    wsn.plot_clusters(title="Clustering HEED", ax=axes[1])
+
+    ax = axes[2]
+    if segments is not None and len(segments):
+        ax.add_collection(LineCollection(segments, colors="r", linewidths=1))
+    if sink is not None:
+        ax.plot(sink[0], sink[1], "ks", ms=7)
+    ax.set_xlim(0, wsn.area_size)
+    ax.set_ylim(0, wsn.area_size)
+    ax.set_title("Routing")
+
+    if energies is not None:
+        axes[3].plot(np.arange(len(energies)), energies)
+    axes[3].set_title("Energi Residual Node")
+    axes[3].set_xlabel("Round")
+    axes[3].set_ylabel("Energi Rata-rata")
+    for ax in axes[:3]:
+        ax.set_xlabel("X")
+        ax.set_ylabel("Y")
+    return figures
+
+
+def lifetime_segments(sim):
+    """Segmen rute CH -> parent/sink dari round terakhir LifetimeSimulator."""
+    ch, parent, pos = sim.cluster_heads, sim.parent, sim.wsn.pos
+    if not len(ch):
+        return np.empty((0, 2, 2))
+    next_pos = np.where(parent[:, None] >= 0, pos[ch[np.maximum(parent, 0)]], sim.sink)
+    return np.stack([pos[ch], next_pos], axis=1)
+
+
+def main(argv=None):
+    from wsn import WSN
+    from lifetime import LifetimeSimulator
+
+    parser = argparse.ArgumentParser(description="Simulasi umur jaringan dengan ekspor streaming")
+    parser.add_argument("--nodes", type=int, default=100)
+    parser.add_argument("--area", type=float, default=100)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--p", type=float, default=0.05)
+    parser.add_argument("--max-rounds", type=int, default=10000)
+    parser.add_argument("--stop", choices=["FND", "HND", "LND"], default="LND")
+    parser.add_argument("-o", "--output", default="hasil.xlsx", help="file hasil (.csv/.parquet/.xlsx)")
+    parser.add_argument("--format", choices=FORMATS, default=None)
+    parser.add_argument("--node-energy", action="store_true", help="tulis energi tiap node per round")
+    parser.add_argument("--pdf", help="simpan grafik ke PDF")
+    args = parser.parse_args(argv)
+
+    wsn = WSN(args.nodes, area_size=args.area, seed=args.seed)
+    sim = LifetimeSimulator(wsn, p=args.p, seed=args.seed)
+    tables = ["rounds", "routes", "summary"] + (["node_energy"] if args.node_energy else [])
+    with ResultExporter(args.output, tables=tables, fmt=args.format) as exporter:
+        result = export_lifetime(sim, exporter, args.max_rounds, args.stop, args.node_energy)
+    print(f"FND={result['FND']} HND={result['HND']} LND={result['LND']} "
+          f"({result['rounds']} round) -> {', '.join(exporter.paths)}")
+
+    if args.pdf:
+        save_figures_pdf(render_figures(wsn, lifetime_segments(sim), sim.sink,
+                                        sim.energy_history), args.pdf)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
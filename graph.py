@@ -0,0 +1,210 @@
+# graph.py
+import multiprocessing
+
+import numpy as np
+
+
+class CSRGraph:
+    def __init__(self, indptr, indices, weights):
+        """
+        Graph tak berarah dalam format CSR (setiap edge disimpan dua arah)
+        :param indptr: offset baris, panjang num_nodes + 1
+        :param indices: node tetangga untuk tiap baris
+        :param weights: bobot (jarak) tiap edge, sejajar dengan indices
+        """
+        self.indptr = np.asarray(indptr, dtype=np.intp)
+        self.indices = np.asarray(indices, dtype=np.intp)
+        self.weights = np.asarray(weights, dtype=float)
+        self.num_nodes = len(self.indptr) - 1
+
+    def __len__(self):
+        return self.num_nodes
+
+    @property
+    def degree(self):
+        return np.diff(self.indptr)
+
+    @property
+    def rows(self):
+        """Indeks baris untuk tiap entri (sejajar dengan indices)."""
+        return np.repeat(np.arange(self.num_nodes), self.degree)
+
+    def neighbors(self, i):
+        return self.indices[self.indptr[i]:self.indptr[i + 1]]
+
+    def row_argmin(self, values):
+        """
+        Cari entri bernilai minimum pada tiap baris.
+        :param values: nilai per entri (sejajar dengan indices), inf = abaikan
+        :return: node tetangga dengan nilai terkecil per baris, -1 jika tidak ada
+        """
+        values = np.asarray(values, dtype=float)
+        result = np.full(self.num_nodes, -1, dtype=np.intp)
+        has = self.degree > 0
+        if not has.any():
+            return result
+        # urut per baris lalu per nilai -> entri pertama tiap baris = minimum
+        order = np.lexsort((values, self.rows))
+        first = order[self.indptr[:-1][has]]
+        ok = np.isfinite(values[first])
+        result[np.flatnonzero(has)[ok]] = self.indices[first[ok]]
+        return result
+
+    def to_padded(self, max_degree=None):
+        """
+        Ubah ke tabel tetangga berukuran (num_nodes, D), diisi -1 / inf.
+        :param max_degree: batas D; tetangga diurutkan dari yang terdekat
+        """
+        degree = self.degree
+        width = int(degree.max()) if self.num_nodes and len(self.indices) else 0
+        if max_degree is not None:
+            width = min(width, max_degree)
+
+        rows = self.rows
+        order = np.lexsort((self.weights, rows))
+        rank = np.arange(len(order)) - self.indptr[rows]
+        keep = rank < width
+
+        nbr = np.full((self.num_nodes, width), -1, dtype=np.intp)
+        dist = np.full((self.num_nodes, width), np.inf)
+        nbr[rows[keep], rank[keep]] = self.indices[order][keep]
+        dist[rows[keep], rank[keep]] = self.weights[order][keep]
+        return nbr, dist
+
+    @classmethod
+    def from_networkx(cls, G):
+        """Buat CSRGraph dari graph NetworkX dengan node 0..N-1 dan bobot 'weight'."""
+        n = G.number_of_nodes()
+        edges = np.array([(u, v, w) for u, v, w in G.edges(data="weight", default=1.0)],
+                         dtype=float).reshape(-1, 3)
+        i, j = edges[:, 0].astype(np.intp), edges[:, 1].astype(np.intp)
+        src = np.concatenate([i, j])
+        dst = np.concatenate([j, i])
+        weights = np.concatenate([edges[:, 2], edges[:, 2]])
+        order = np.lexsort((dst, src))
+        indptr = np.zeros(n + 1, dtype=np.intp)
+        np.cumsum(np.bincount(src, minlength=n), out=indptr[1:])
+        return cls(indptr, dst[order], weights[order])
+
+    def to_networkx(self):
+        import networkx as nx
+
+        G = nx.Graph()
+        G.add_nodes_from(range(self.num_nodes))
+        rows = self.rows
+        upper = rows < self.indices
+        G.add_weighted_edges_from(zip(rows[upper].tolist(),
+                                      self.indices[upper].tolist(),
+                                      self.weights[upper].tolist()))
+        return G
+
+
+def dense_distance(graph, n):
+    """
+    Matriks jarak padat (n, n) dari graph NetworkX; inf untuk pasangan tanpa
+    edge. NetworkX diimpor saat dibutuhkan.
+    """
+    import networkx as nx
+
+    return nx.to_numpy_array(graph, nodelist=range(n), weight='weight', nonedge=np.inf)
+
+
+def radius_neighbors(pos, radius, n_workers=None):
+    """
+    Cari semua pasangan node berjarak <= radius memakai grid hash
+    (sel berukuran radius, cukup periksa 3x3 sel di sekitarnya).
+    :param pos: koordinat node, bentuk (N, 2)
+    :param radius: jangkauan transmisi
+    :param n_workers: jika > 1, area dibagi menjadi tile (pita x) dengan
+        halo selebar radius dan tiap tile diproses di process pool; hasil
+        sama persis dengan versi serial
+    :return: CSRGraph
+    """
+    pos = np.asarray(pos, dtype=float)
+    n = len(pos)
+    if radius <= 0:
+        raise ValueError("radius harus > 0")
+    if n == 0:
+        return CSRGraph(np.zeros(1, dtype=np.intp), [], [])
+    if n_workers is not None and n_workers > 1:
+        return _tiled_radius_neighbors(pos, radius, n_workers)
+    src, dst, dist = _grid_pairs(pos, radius)
+    return _to_csr(n, src, dst, dist)
+
+
+def _grid_pairs(pos, radius):
+    """Pasangan (src, dst, jarak) berjarak <= radius, tanpa urutan tertentu."""
+
+    cell = np.floor((pos - pos.min(axis=0)) / radius).astype(np.int64)
+    n_cy = int(cell[:, 1].max()) + 1
+    key = cell[:, 0] * n_cy + cell[:, 1]
+
+    order = np.argsort(key, kind="stable")
+    sorted_key = key[order]
+    uniq, start, count = np.unique(sorted_key, return_index=True, return_counts=True)
+
+    src_parts, dst_parts = [], []
+    for dx in (-1, 0, 1):
+        for dy in (-1, 0, 1):
+            cy = cell[:, 1] + dy
+            target = (cell[:, 0] + dx) * n_cy + cy
+            valid = (cy >= 0) & (cy < n_cy)
+            slot = np.searchsorted(uniq, target)
+            slot = np.minimum(slot, len(uniq) - 1)
+            valid &= uniq[slot] == target
+
+            src = np.flatnonzero(valid)
+            cnt = count[slot[src]]
+            # pasangkan tiap node dengan semua isi sel tujuan
+            src_rep = np.repeat(src, cnt)
+            offset = np.arange(cnt.sum()) - np.repeat(np.cumsum(cnt) - cnt, cnt)
+            dst = order[np.repeat(start[slot[src]], cnt) + offset]
+            src_parts.append(src_rep)
+            dst_parts.append(dst)
+
+    src = np.concatenate(src_parts)
+    dst = np.concatenate(dst_parts)
+    dist = np.linalg.norm(pos[src] - pos[dst], axis=1)
+    keep = (src != dst) & (dist <= radius)
+    return src[keep], dst[keep], dist[keep]
+
+
+def _to_csr(n, src, dst, dist):
+    order = np.lexsort((dst, src))
+    src, dst, dist = src[order], dst[order], dist[order]
+    indptr = np.zeros(n + 1, dtype=np.intp)
+    np.cumsum(np.bincount(src, minlength=n), out=indptr[1:])
+    return CSRGraph(indptr, dst, dist)
+
+
+def _tiled_radius_neighbors(pos, radius, n_workers):
+    """radius_neighbors paralel: tile berupa pita x dengan jumlah node seimbang."""
+    n_tiles = 2 * n_workers
+    edges = np.quantile(pos[:, 0], np.linspace(0, 1, n_tiles + 1))
+    edges[-1] = np.inf
+    tiles = [(edges[k], edges[k + 1]) for k in range(n_tiles)]
+    with multiprocessing.Pool(n_workers, initializer=_tile_init, initargs=(pos, radius)) as pool:
+        parts = pool.map(_tile_pairs, tiles)
+    src, dst, dist = (np.concatenate(x) for x in zip(*parts))
+    return _to_csr(len(pos), src, dst, dist)
+
+
+# ---------- Worker tile (harus top-level agar bisa di-pickle) ----------
+_tile = {}
+
+
+def _tile_init(pos, radius):
+    _tile["pos"] = pos
+    _tile["radius"] = radius
+
+
+def _tile_pairs(bounds):
+    """Pasangan untuk node dengan x di [lo, hi); node halo hanya sebagai tujuan."""
+    pos, radius = _tile["pos"], _tile["radius"]
+    lo, hi = bounds
+    x = pos[:, 0]
+    local = np.flatnonzero((x >= lo - radius) & (x < hi + radius))
+    src, dst, dist = _grid_pairs(pos[local], radius)
+    src, dst = local[src], local[dst]
+    own = (x[src] >= lo) & (x[src] < hi)
+    return src[own], dst[own], dist[own]
@@ -1,37 +1,275 @@
 import numpy as np
 
+import instrument
+from graph import radius_neighbors
+
 class HEED:
-    def __init__(self, wsn, p=0.05):
+    def __init__(self, wsn, p=0.05, graph=None, seed=None, p_min=1e-4):
         """
         HEED clustering sederhana
         :param wsn: objek WSN
         :param p: probabilitas awal menjadi cluster head
+        :param graph: CSRGraph jangkauan radio (opsional); jika diberikan,
+            node hanya bergabung ke CH yang berada dalam jangkauannya
+        :param seed: seed RNG
+        :param p_min: batas bawah CH_prob pada HEED iteratif
         """
         self.wsn = wsn
         self.p = p
+        self.graph = graph
+        self.p_min = p_min
+        self.rng = np.random.default_rng(seed)
+        self.iterations = 0
 
     def select_cluster_heads(self):
+        with instrument.stage("heed"):
+            return self._select_simple()
+
+    def _select_simple(self):
         n = self.wsn.num_nodes
         energy = self.wsn.energy
+        alive = energy > 0  # node mati tidak ikut clustering
+        if not alive.any():
+            return self._finalize([])
         prob = self.p + (energy / max(energy)) * (1 - self.p)
+        prob[~alive] = 0.0
 
-        # pilih cluster head secara probabilistik
-        ch = []
-        for i in range(n):
-            if np.random.rand() < prob[i]:
-                ch.append(i)
+        # pilih cluster head secara probabilistik (satu undian Bernoulli vektor)
+        ch = np.flatnonzero(self.rng.random(n) < prob).tolist()
 
         # jika kosong, pilih minimal 1 node random
         if len(ch) == 0:
-            ch = [np.random.randint(0, n)]
+            ch = [int(self.rng.choice(np.flatnonzero(alive)))]
+
+        return self._finalize(ch)
+
+    def select_cluster_heads_iterative(self):
+        """
+        HEED iteratif: CH_prob = max(p * E/E_max, p_min) digandakan tiap
+        iterasi hingga 1. Node yang belum mendengar CH (tentative/final) di
+        sekitarnya mengundi menjadi tentative CH; tentative CH menjadi final
+        saat CH_prob-nya mencapai 1. Tanpa graph, seluruh jaringan dianggap
+        satu lingkungan.
+        """
+        with instrument.stage("heed"):
+            return self._select_iterative()
+
+    def _select_iterative(self):
+        n = self.wsn.num_nodes
+        energy = self.wsn.energy
+        alive = energy > 0
+        if not alive.any():
+            return self._finalize([])
+        ch_prob = np.maximum(self.p * energy / max(energy), self.p_min)
+        ch_prob = np.minimum(ch_prob, 1.0)
+
+        tentative = np.zeros(n, dtype=bool)
+        final = np.zeros(n, dtype=bool)
+        self.iterations = 0
+
+        while True:
+            self.iterations += 1
+            is_ch = tentative | final
+            free = alive & ~is_ch & ~self._hears(is_ch)
+
+            final |= free & (ch_prob >= 1)
+            tentative |= free & (ch_prob < 1) & (self.rng.random(n) < ch_prob)
+
+            # tentative CH dengan CH_prob = 1 menjadi final
+            final |= tentative & (ch_prob >= 1)
+            tentative &= ~final
+
+            if (ch_prob >= 1).all():
+                break
+            ch_prob = np.minimum(2 * ch_prob, 1.0)
+
+        ch = np.flatnonzero(final).tolist()
+        if len(ch) == 0:
+            ch = [int(np.argmax(energy))]
+        return self._finalize(ch)
+
+    def _hears(self, is_ch):
+        """True untuk node yang memiliki CH di lingkungan (tetangga) radionya."""
+        if self.graph is None:
+            return np.full(len(is_ch), is_ch.any())
+        rows = self.graph.rows[is_ch[self.graph.indices]]
+        return np.bincount(rows, minlength=len(is_ch)) > 0
+
+    def _finalize(self, ch):
+        """
+        Isi wsn.cluster_heads dan wsn.clusters dari daftar CH terpilih.
+        Node mati mendapat cluster -1.
+        """
+        alive = self.wsn.energy > 0
+        if len(ch) == 0:
+            clusters = np.full(self.wsn.num_nodes, -1, dtype=int)
+        elif self.graph is not None:
+            ch, clusters = self._assign_in_range(ch, alive)
+        else:
+            clusters = nearest_cluster_head(self.wsn.pos, ch)
+        clusters[~alive] = -1
 
         self.wsn.cluster_heads = ch
+        self.wsn.clusters = clusters
+        return ch
+
+    def _assign_in_range(self, ch, alive):
+        """
+        Gabungkan tiap node ke CH terdekat di antara tetangga radionya.
+        Node hidup yang tidak menjangkau CH mana pun menjadi CH bagi dirinya sendiri.
+        """
+        n = self.wsn.num_nodes
+        is_ch = np.zeros(n, dtype=bool)
+        is_ch[ch] = True
+
+        values = np.where(is_ch[self.graph.indices], self.graph.weights, np.inf)
+        clusters = self.graph.row_argmin(values)
+        clusters[is_ch] = np.flatnonzero(is_ch)
 
-        # --- Assign tiap node ke cluster head terdekat ---
-        clusters = np.zeros(n, dtype=int)
-        for i in range(n):
-            dists = [np.linalg.norm(self.wsn.pos[i] - self.wsn.pos[ch_id]) for ch_id in ch]
-            clusters[i] = ch[np.argmin(dists)]  # pilih CH terdekat
+        orphan = (clusters < 0) & alive
+        clusters[orphan] = np.flatnonzero(orphan)
+        is_ch |= orphan
+        return np.flatnonzero(is_ch).tolist(), clusters
 
+
+class SpatialHEED(HEED):
+    def __init__(self, wsn, cluster_radius, p=0.05, seed=None, p_min=1e-4, cost="amrp",
+                 graph=None, n_workers=None):
+        """
+        HEED dengan radius cluster untuk jaringan besar. Node dikelompokkan ke
+        grid bersel cluster_radius (radius_neighbors), sehingga pemilihan CH,
+        tie-breaking biaya dan penggabungan anggota hanya melihat sel
+        tetangga; satu round O(N) untuk kepadatan node tetap.
+        :param cluster_radius: jangkauan intra-cluster
+        :param cost: biaya intra-cluster untuk tie-breaking: "amrp" (average
+            minimum reachability power, rata-rata d^2 ke tetangga hidup) atau
+            "degree" (1 / jumlah tetangga hidup)
+        :param graph: CSRGraph radius cluster yang sudah ada; None = dibangun
+            dari wsn.pos
+        :param n_workers: jumlah proses untuk membangun grid per tile
+        """
+        if cost not in ("amrp", "degree"):
+            raise ValueError(f"biaya HEED tidak dikenal: {cost!r}")
+        if graph is None:
+            graph = radius_neighbors(wsn.pos, cluster_radius, n_workers=n_workers)
+        super().__init__(wsn, p=p, graph=graph, seed=seed, p_min=p_min)
+        self.cluster_radius = cluster_radius
+        self.cost = cost
+        self._rows = graph.rows
+        self._has = graph.degree > 0
+        self._starts = graph.indptr[:-1][self._has]
+
+    def select_cluster_heads(self):
+        """
+        HEED iteratif dengan biaya: tiap iterasi node memilih CH termurah di
+        antara tentative/final CH dalam cluster_radius (termasuk dirinya).
+        Tentative CH yang mendengar CH lebih murah mundur; node tanpa CH di
+        sekitarnya mengundi dengan CH_prob (digandakan tiap iterasi). Di
+        akhir, node bergabung ke final CH termurah dalam jangkauan, atau
+        menjadi final CH jika tidak ada.
+        """
+        with instrument.stage("heed"):
+            return self._select_spatial()
+
+    def select_cluster_heads_iterative(self):
+        return self.select_cluster_heads()
+
+    def node_cost(self, alive):
+        """Biaya intra-cluster tiap node dari tetangga hidup (inf jika terisolasi)."""
+        n = self.wsn.num_nodes
+        live = alive[self.graph.indices]
+        rows = self._rows[live]
+        count = np.bincount(rows, minlength=n)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            if self.cost == "amrp":
+                power = np.bincount(rows, weights=self.graph.weights[live] ** 2, minlength=n)
+                cost = power / count
+            else:
+                cost = 1.0 / count
+        cost[count == 0] = np.inf
+        return cost
+
+    def _least_cost(self, is_ch, rank):
+        """Peringkat CH termurah di antara tetangga tiap node (n jika tidak ada)."""
+        n = self.wsn.num_nodes
+        best = np.full(n, n, dtype=np.intp)
+        if len(self._starts):
+            indices = self.graph.indices
+            values = np.where(is_ch[indices], rank[indices], n)
+            best[self._has] = np.minimum.reduceat(values, self._starts)
+        return best
+
+    def _select_spatial(self):
+        n = self.wsn.num_nodes
+        energy = self.wsn.energy
+        alive = energy > 0
+        if not alive.any():
+            return self._finalize([])
+        ch_prob = np.maximum(self.p * energy / max(energy), self.p_min)
+        ch_prob = np.minimum(ch_prob, 1.0)
+        ch_prob[~alive] = 1.0  # node mati tidak ikut, jangan memperpanjang iterasi
+
+        # peringkat unik (biaya, id) -> tie-breaking cukup membandingkan integer
+        rank = np.empty(n, dtype=np.intp)
+        rank[np.lexsort((np.arange(n), self.node_cost(alive)))] = np.arange(n)
+        rank_node = np.argsort(rank)
+
+        tentative = np.zeros(n, dtype=bool)
+        final = np.zeros(n, dtype=bool)
+        self.iterations = 0
+
+        while True:
+            self.iterations += 1
+            is_ch = tentative | final
+            heard = self._least_cost(is_ch, rank)
+
+            tentative &= rank < heard  # mundur jika ada CH lebih murah
+            free = alive & ~tentative & ~final & (heard == n)
+            final |= free & (ch_prob >= 1)
+            tentative |= free & (ch_prob < 1) & (self.rng.random(n) < ch_prob)
+
+            final |= tentative & (ch_prob >= 1)
+            tentative &= ~final
+
+            if (ch_prob >= 1).all():
+                break
+            ch_prob = np.minimum(2 * ch_prob, 1.0)
+
+        # gabung ke final CH termurah; node tanpa final CH di sekitarnya menjadi CH
+        heard = self._least_cost(final, rank)
+        final |= alive & (heard == n)
+        clusters = np.where(final, np.arange(n), rank_node[np.minimum(heard, n - 1)])
+        clusters[~alive] = -1
+
+        ch = np.flatnonzero(final).tolist()
+        self.wsn.cluster_heads = ch
         self.wsn.clusters = clusters
-        return ch
\ No newline at end of file
+        return ch
+
+
+def nearest_cluster_head(pos, ch, block=1 << 20):
+    """
+    Cari CH terdekat untuk setiap node. Memakai KD-tree SciPy jika tersedia,
+    selain itu broadcasting NumPy per blok (matriks jarak sementara <= block
+    elemen).
+    :param pos: koordinat node, bentuk (N, 2)
+    :param ch: indeks node cluster head
+    :return: array berisi id CH terdekat tiap node
+    """
+    ch = np.asarray(ch, dtype=int)
+    ch_pos = pos[ch]
+    try:
+        from scipy.spatial import cKDTree
+    except ImportError:
+        cKDTree = None
+    if cKDTree is not None:
+        _, nearest = cKDTree(ch_pos).query(pos)
+        return ch[nearest]
+
+    clusters = np.empty(len(pos), dtype=int)
+    step = max(1, block // max(1, len(ch)))
+    for s in range(0, len(pos), step):
+        diff = pos[s:s + step, None, :] - ch_pos[None, :, :]
+        d2 = np.einsum("ijk,ijk->ij", diff, diff)
+        clusters[s:s + step] = ch[np.argmin(d2, axis=1)]
+    return clusters
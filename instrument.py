@@ -0,0 +1,126 @@
+# instrument.py
+"""
+Instrumentasi ringan per tahap pipeline (timer, counter, profiler opsional).
+
+Nonaktif secara default: stage() mengembalikan context manager kosong dan
+count() langsung kembali, sehingga overhead hampir nol.
+
+    stats = instrument.enable(profile="cprofile")   # atau "pyinstrument"
+    ... jalankan simulasi ...
+    instrument.disable()
+    print(stats.format_report())
+"""
+import contextlib
+import io
+import time
+from collections import defaultdict
+
+_NULL = contextlib.nullcontext()
+_active = None
+
+
+class Stats:
+    def __init__(self):
+        self.timers = defaultdict(float)  # total detik per tahap
+        self.calls = defaultdict(int)     # jumlah pemanggilan per tahap
+        self.counters = defaultdict(int)
+        self.profile_text = ""
+        self._profiler = None
+        self._profile_kind = None
+
+    @contextlib.contextmanager
+    def timer(self, name):
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timers[name] += time.perf_counter() - t0
+            self.calls[name] += 1
+
+    def count(self, name, n=1):
+        self.counters[name] += n
+
+    def start_profile(self, kind):
+        """Mulai profiler di thread pemanggil. :param kind: "cprofile" atau "pyinstrument" """
+        if kind == "cprofile":
+            import cProfile
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+        elif kind == "pyinstrument":
+            from pyinstrument import Profiler
+            self._profiler = Profiler()
+            self._profiler.start()
+        else:
+            raise ValueError(f"profiler tidak dikenal: {kind!r}")
+        self._profile_kind = kind
+
+    def stop_profile(self, limit=25):
+        """Hentikan profiler dan simpan ringkasannya di profile_text."""
+        if self._profiler is None:
+            return
+        if self._profile_kind == "cprofile":
+            import pstats
+            self._profiler.disable()
+            out = io.StringIO()
+            pstats.Stats(self._profiler, stream=out).sort_stats("cumulative").print_stats(limit)
+            self.profile_text = out.getvalue()
+        else:
+            self._profiler.stop()
+            self.profile_text = self._profiler.output_text()
+        self._profiler = None
+
+    def report(self):
+        """Ringkasan sebagai dict: {"stages": {nama: {seconds, calls}}, "counters": {...}}"""
+        return {
+            "stages": {name: {"seconds": self.timers[name], "calls": self.calls[name]}
+                       for name in self.timers},
+            "counters": dict(self.counters),
+        }
+
+    def format_report(self):
+        lines = ["Tahap:"]
+        for name, secs in sorted(self.timers.items(), key=lambda kv: -kv[1]):
+            lines.append(f"  {name:<16} {secs * 1e3:10.1f} ms  ({self.calls[name]}x)")
+        if self.counters:
+            lines.append("Counter:")
+            for name, value in sorted(self.counters.items()):
+                lines.append(f"  {name:<16} {value:>12,}")
+        return "\n".join(lines)
+
+
+def enable(profile=None):
+    """
+    Aktifkan instrumentasi global dengan Stats baru.
+    :param profile: None, "cprofile" atau "pyinstrument" (profil thread pemanggil)
+    :return: Stats aktif
+    """
+    global _active
+    _active = Stats()
+    if profile:
+        _active.start_profile(profile)
+    return _active
+
+
+def disable():
+    """Nonaktifkan instrumentasi. :return: Stats yang baru saja aktif (atau None)"""
+    global _active
+    stats, _active = _active, None
+    if stats is not None:
+        stats.stop_profile()
+    return stats
+
+
+def active():
+    return _active
+
+
+def stage(name):
+    """Context manager pengukur waktu tahap `name` (kosong jika nonaktif)."""
+    if _active is None:
+        return _NULL
+    return _active.timer(name)
+
+
+def count(name, n=1):
+    if _active is not None:
+        _active.counters[name] += n
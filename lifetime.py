@@ -0,0 +1,262 @@
+# lifetime.py
+import numpy as np
+
+import instrument
+from aco import AntColony
+from heed import HEED, SpatialHEED
+
+
+class RadioModel:
+    def __init__(self, e_elec=50e-9, eps_fs=10e-12, eps_mp=0.0013e-12,
+                 e_da=5e-9, packet_bits=4000):
+        """
+        Model radio orde pertama (first-order radio model)
+        :param e_elec: energi elektronik per bit (J/bit)
+        :param eps_fs: penguat free-space, d^2 (J/bit/m^2)
+        :param eps_mp: penguat multipath, d^4 (J/bit/m^4)
+        :param e_da: energi agregasi data per bit (J/bit)
+        :param packet_bits: ukuran paket (bit)
+        """
+        self.e_elec = e_elec
+        self.eps_fs = eps_fs
+        self.eps_mp = eps_mp
+        self.e_da = e_da
+        self.packet_bits = packet_bits
+        self.d0 = np.sqrt(eps_fs / eps_mp)  # jarak ambang d^2 / d^4
+
+    def tx(self, d):
+        """Energi kirim satu paket sejauh d."""
+        d = np.asarray(d, dtype=float)
+        k = self.packet_bits
+        amp = np.where(d < self.d0, self.eps_fs * d ** 2, self.eps_mp * d ** 4)
+        return k * self.e_elec + k * amp
+
+    def rx(self, n_packets=1):
+        """Energi terima n_packets paket."""
+        return np.asarray(n_packets) * self.packet_bits * self.e_elec
+
+    def aggregate(self, n_packets=1):
+        """Energi agregasi n_packets paket menjadi satu."""
+        return np.asarray(n_packets) * self.packet_bits * self.e_da
+
+
+def greedy_route(pos, ch, sink):
+    """
+    Routing multi-hop antar CH: tiap CH meneruskan ke CH terdekat yang lebih
+    dekat ke sink, atau langsung ke sink jika sink lebih dekat.
+    :return: parent tiap CH (indeks di dalam ch), -1 = langsung ke sink
+    """
+    ch_pos = pos[ch]
+    to_sink = np.linalg.norm(ch_pos - sink, axis=1)
+    d = np.linalg.norm(ch_pos[:, None, :] - ch_pos[None, :, :], axis=2)
+    d[to_sink[None, :] >= to_sink[:, None]] = np.inf  # hanya maju ke arah sink
+
+    parent = np.argmin(d, axis=1)
+    hop = d[np.arange(len(ch)), parent]
+    parent[hop >= to_sink] = -1
+    return parent
+
+
+class ACORouter:
+    def __init__(self, radio=None, radius=None, n_ants=10, n_iterations=10, decay=0.5,
+                 seed=None, **colony_args):
+        """
+        Router LifetimeSimulator (pengganti greedy_route) berbasis
+        AntColony.run_multi: semua CH dirutekan ke sink dalam satu run di atas
+        graph CH + sink (node terakhir). Bobot edge = energi satu hop
+        (tx(d) + rx) dalam satuan energi elektronik per hop, sehingga rute
+        tidak selalu langsung ke sink seperti pada bobot jarak. Feromon antar
+        CH yang terpilih lagi dibawa dari round sebelumnya (warm start).
+        :param radio: RadioModel untuk bobot edge; None = parameter standar
+        :param radius: jangkauan hop antar CH; None = semua pasangan (CH
+            selalu boleh langsung ke sink)
+        :param n_ants: jumlah semut per round
+        :param n_iterations: jumlah iterasi per round
+        :param decay: faktor penguapan feromon
+        :param seed: seed RNG koloni
+        :param colony_args: argumen AntColony lain (mis. variant, alpha, beta)
+        """
+        self.radio = radio if radio is not None else RadioModel()
+        self.radius = radius
+        self.n_ants = n_ants
+        self.n_iterations = n_iterations
+        self.decay = decay
+        self.colony_args = colony_args
+        self.rng = np.random.default_rng(seed)
+        self._nodes = None      # id node WSN tiap baris feromon (-1 = sink)
+        self._pheromone = None  # feromon round sebelumnya
+
+    def _graph(self, pos, ch, sink):
+        """Graph NetworkX atas CH dan sink (indeks len(ch)) berbobot energi per hop."""
+        import networkx as nx  # impor saat dibutuhkan
+
+        points = np.vstack([pos[ch], sink])
+        i, j = np.triu_indices(len(points), k=1)
+        d = np.linalg.norm(points[i] - points[j], axis=1)
+        keep = j == len(ch)
+        if self.radius is None:
+            keep[:] = True
+        else:
+            keep |= d <= self.radius
+        radio = self.radio
+        unit = radio.tx(0.0) + radio.rx()
+        weight = (radio.tx(d[keep]) + radio.rx()) / unit
+
+        G = nx.Graph()
+        G.add_nodes_from(range(len(points)))
+        G.add_weighted_edges_from(zip(i[keep].tolist(), j[keep].tolist(), weight.tolist()))
+        return G
+
+    def _warm_start(self, nodes):
+        """Feromon awal: blok CH yang juga terpilih round sebelumnya dibawa."""
+        if self._nodes is None:
+            return None
+        previous = {node: k for k, node in enumerate(self._nodes.tolist())}
+        index = np.array([previous.get(node, -1) for node in nodes.tolist()])
+        shared = index >= 0
+        if shared.sum() < 2:
+            return None
+        block = self._pheromone[np.ix_(index[shared], index[shared])]
+        pheromone = np.full((len(nodes), len(nodes)), block.mean())
+        pheromone[np.ix_(shared, shared)] = block
+        return pheromone
+
+    def __call__(self, pos, ch, sink):
+        ch = np.asarray(ch, dtype=int)
+        nodes = np.append(ch, -1)
+        colony = AntColony(self._graph(pos, ch, sink), self.n_ants, self.n_iterations,
+                           self.decay, engine="numpy", seed=int(self.rng.integers(2 ** 32)),
+                           pheromone=self._warm_start(nodes), **self.colony_args)
+        tree, _ = colony.run_multi(np.arange(len(ch)), len(ch))
+        self._nodes, self._pheromone = nodes, colony.pheromone
+
+        parent = np.full(len(ch), -1)
+        for u, v in tree.items():
+            if v != len(ch):
+                parent[u] = v
+        return parent
+
+
+class LifetimeSimulator:
+    def __init__(self, wsn, radio=None, sink=None, p=0.05, graph=None,
+                 iterative=True, router=None, seed=None, cluster_radius=None):
+        """
+        Simulasi umur jaringan berbasis round: re-clustering HEED setiap round,
+        routing CH ke sink, dan konsumsi energi model radio orde pertama.
+        :param wsn: objek WSN (energi node dikurangi selama simulasi)
+        :param radio: RadioModel; None = parameter standar
+        :param sink: koordinat base station; None = tengah area
+        :param p: probabilitas awal CH untuk HEED
+        :param graph: CSRGraph jangkauan radio untuk HEED (opsional)
+        :param iterative: pakai HEED iteratif (CH_prob digandakan); False =
+            select_cluster_heads() sederhana
+        :param router: fungsi (pos, ch, sink) -> parent, mis. ACORouter;
+            None = greedy_route (geometris, jauh lebih cepat)
+        :param seed: seed RNG HEED
+        :param cluster_radius: jika diisi, clustering memakai SpatialHEED
+            (grid per radius cluster, tie-breaking AMRP); graph, jika
+            diberikan, harus graph radius cluster tersebut
+        """
+        self.wsn = wsn
+        self.radio = radio if radio is not None else RadioModel()
+        if sink is None:
+            sink = (wsn.area_size / 2, wsn.area_size / 2)
+        self.sink = np.asarray(sink, dtype=float)
+        if cluster_radius is not None:
+            self.heed = SpatialHEED(wsn, cluster_radius, p=p, seed=seed, graph=graph)
+        else:
+            self.heed = HEED(wsn, p=p, graph=graph, seed=seed)
+        self.iterative = iterative
+        self.router = router if router is not None else greedy_route
+
+        self.rounds = 0
+        self.fnd = None  # first node dead
+        self.hnd = None  # half nodes dead
+        self.lnd = None  # last node dead
+        self.alive_history = []
+        self.energy_history = []
+        self.ch_history = []
+        self.cluster_heads = np.empty(0, dtype=int)  # CH round terakhir
+        self.parent = np.empty(0, dtype=int)         # parent tiap CH round terakhir
+
+    def _round_energy(self, ch, parent):
+        """Hitung konsumsi energi tiap node untuk satu round."""
+        wsn, radio = self.wsn, self.radio
+        n = wsn.num_nodes
+        cost = np.zeros(n)
+        alive = wsn.clusters >= 0
+
+        # anggota cluster mengirim satu paket ke CH-nya
+        members = alive.copy()
+        members[ch] = False
+        d = np.linalg.norm(wsn.pos[members] - wsn.pos[wsn.clusters[members]], axis=1)
+        cost[members] += radio.tx(d)
+        n_members = np.bincount(wsn.clusters[members], minlength=n)[ch]
+
+        # beban relay: jumlah paket agregat yang melewati tiap CH
+        load = np.ones(len(ch), dtype=int)
+        ancestor = parent.copy()
+        for _ in range(len(ch)):
+            hop = ancestor >= 0
+            if not hop.any():
+                break
+            np.add.at(load, ancestor[hop], 1)
+            ancestor[hop] = parent[ancestor[hop]]
+
+        next_pos = np.where(parent[:, None] >= 0, wsn.pos[ch[np.maximum(parent, 0)]], self.sink)
+        d_next = np.linalg.norm(wsn.pos[ch] - next_pos, axis=1)
+        cost[ch] += (radio.rx(n_members) + radio.aggregate(n_members + 1)
+                     + radio.rx(load - 1) + load * radio.tx(d_next))
+        return cost
+
+    def step(self):
+        """Jalankan satu round. :return: jumlah node hidup setelah round"""
+        wsn = self.wsn
+        if self.iterative:
+            ch = self.heed.select_cluster_heads_iterative()
+        else:
+            ch = self.heed.select_cluster_heads()
+        ch = np.asarray(ch, dtype=int)
+        parent = np.empty(0, dtype=int)
+
+        if len(ch):
+            with instrument.stage("routing"):
+                parent = np.asarray(self.router(wsn.pos, ch, self.sink), dtype=int)
+            with instrument.stage("energy"):
+                wsn.energy = np.maximum(wsn.energy - self._round_energy(ch, parent), 0)
+        self.cluster_heads, self.parent = ch, parent
+
+        self.rounds += 1
+        n_alive = int((wsn.energy > 0).sum())
+        self.alive_history.append(n_alive)
+        self.energy_history.append(float(wsn.energy.mean()))
+        self.ch_history.append(len(ch))
+
+        n = wsn.num_nodes
+        if self.fnd is None and n_alive < n:
+            self.fnd = self.rounds
+        if self.hnd is None and n_alive <= n / 2:
+            self.hnd = self.rounds
+        if self.lnd is None and n_alive == 0:
+            self.lnd = self.rounds
+        return n_alive
+
+    def run(self, max_rounds=10000, stop="LND", on_round=None):
+        """
+        Jalankan round hingga kriteria berhenti tercapai
+        :param max_rounds: batas jumlah round
+        :param stop: "FND", "HND" atau "LND"
+        :param on_round: fungsi (simulator) yang dipanggil setelah tiap round,
+            mis. untuk ekspor streaming
+        :return: dict berisi round FND/HND/LND (None jika belum tercapai)
+        """
+        if stop not in ("FND", "HND", "LND"):
+            raise ValueError(f"kriteria berhenti tidak dikenal: {stop!r}")
+        attr = stop.lower()
+
+        while self.rounds < max_rounds and getattr(self, attr) is None:
+            self.step()
+            if on_round is not None:
+                on_round(self)
+
+        return {"FND": self.fnd, "HND": self.hnd, "LND": self.lnd, "rounds": self.rounds}
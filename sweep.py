@@ -0,0 +1,184 @@
+# sweep.py
+"""
+Runner headless untuk sweep parameter WSN + HEED + ACO (tanpa Qt/matplotlib).
+
+Contoh spec (JSON):
+    {
+        "base": {"area_size": 100, "n_iterations": 50},
+        "grid": {"num_nodes": [50, 100], "n_ants": [10, 20], "decay": [0.3, 0.5]},
+        "seeds": 100
+    }
+
+Pemakaian:
+    python sweep.py spec.json -o hasil.csv -j 8
+"""
+import argparse
+import itertools
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+from wsn import WSN
+from heed import HEED, SpatialHEED
+from aco import AntColony
+from lifetime import ACORouter, LifetimeSimulator
+from cost import EnergyAwareRouter
+from export import FORMATS, guess_format, open_sink
+
+# parameter yang bisa di-sweep beserta nilai default (sama dengan GUI)
+DEFAULTS = {
+    "num_nodes": 50,
+    "area_size": 100,
+    "n_ants": 20,
+    "n_iterations": 50,
+    "decay": 0.5,
+    "alpha": 1,
+    "beta": 2,
+    "p": 0.05,
+    "radius": None,
+    "cluster_radius": None,  # SpatialHEED jika diisi
+    "patience": None,
+    "variant": "as",
+    "lifetime": False,
+    "w_energy": 0.0,  # bobot penalti energi router lifetime (0 = greedy_route)
+    "w_hop": 0.0,
+    "aco_router": False,  # router lifetime ACORouter (run_multi per round) alih-alih greedy
+}
+RESULT_KEYS = ["best_cost", "hops", "iterations_run", "n_cluster_heads", "final_energy",
+               "fnd", "hnd", "lnd", "runtime", "error"]
+COLUMNS = list(DEFAULTS) + ["seed"] + RESULT_KEYS
+
+
+def expand_spec(spec):
+    """
+    Jabarkan spec menjadi daftar parameter run (produk kartesius grid x seed).
+    :param spec: dict dengan kunci "base", "grid" dan "seeds" (int atau list)
+    """
+    unknown = (set(spec.get("base", {})) | set(spec.get("grid", {}))) - set(DEFAULTS)
+    if unknown:
+        raise ValueError(f"parameter tidak dikenal: {sorted(unknown)}")
+
+    base = dict(DEFAULTS, **spec.get("base", {}))
+    grid = spec.get("grid", {})
+    seeds = spec.get("seeds", 1)
+    if isinstance(seeds, int):
+        seeds = list(range(seeds))
+
+    names = list(grid)
+    runs = []
+    for values in itertools.product(*(grid[name] for name in names)):
+        for seed in seeds:
+            params = dict(base, **dict(zip(names, values)))
+            params["seed"] = seed
+            runs.append(params)
+    return runs
+
+
+def run_one(params):
+    """Jalankan satu simulasi lengkap; hasil dikembalikan sebagai dict satu baris."""
+    row = dict(params)
+    t0 = time.perf_counter()
+    try:
+        wsn = WSN(num_nodes=params["num_nodes"], area_size=params["area_size"], init_energy=1.0,
+                  seed=params["seed"])
+        if params["cluster_radius"] is None:
+            ch = HEED(wsn, p=params["p"], seed=params["seed"]).select_cluster_heads()
+        else:
+            ch = SpatialHEED(wsn, params["cluster_radius"], p=params["p"],
+                             seed=params["seed"]).select_cluster_heads()
+
+        if params["radius"] is None:
+            graph = wsn.build_graph()
+        else:
+            graph = wsn.build_graph(radius=params["radius"], fmt="csr")
+        aco = AntColony(graph, n_ants=params["n_ants"], n_iterations=params["n_iterations"],
+                        decay=params["decay"], alpha=params["alpha"], beta=params["beta"],
+                        engine="numpy", seed=params["seed"], patience=params["patience"],
+                        variant=params["variant"])
+        best_path, best_cost = aco.run(start=0, end=wsn.num_nodes - 1)
+
+        row.update(best_cost=best_cost, n_cluster_heads=len(ch),
+                   iterations_run=len(aco.convergence["best"]),
+                   hops=len(best_path) - 1 if best_path else None)
+        if best_path:
+            row["final_energy"] = float(wsn.simulate_transmission(best_path)[-1])
+
+        if params["lifetime"]:
+            wsn.energy = np.ones(wsn.num_nodes) * wsn.init_energy
+            router = None
+            if params["aco_router"]:
+                router = ACORouter(seed=params["seed"], variant=params["variant"])
+            elif params["w_energy"] or params["w_hop"]:
+                router = EnergyAwareRouter(wsn, w_energy=params["w_energy"], w_hop=params["w_hop"])
+            sim = LifetimeSimulator(wsn, p=params["p"], seed=params["seed"], router=router,
+                                    cluster_radius=params["cluster_radius"])
+            res = sim.run()
+            row.update(fnd=res["FND"], hnd=res["HND"], lnd=res["LND"])
+    except Exception as exc:
+        row["error"] = f"{type(exc).__name__}: {exc}"
+    row["runtime"] = time.perf_counter() - t0
+    return row
+
+
+def run_sweep(spec, output, n_workers=None, fmt=None, progress=None):
+    """
+    Jalankan seluruh sweep di process pool dan tulis hasil ke CSV/Parquet/Excel
+    segera setelah tiap run selesai.
+    :param spec: dict spec (lihat expand_spec)
+    :param output: path file hasil
+    :param n_workers: jumlah proses; None = jumlah CPU
+    :param fmt: "csv", "parquet" atau "xlsx"; None = ditebak dari ekstensi output
+    :param progress: fungsi (selesai, total) opsional
+    :return: jumlah run yang gagal
+    """
+    fmt = fmt or guess_format(output)
+    if fmt not in FORMATS:
+        raise ValueError(f"format output tidak dikenal: {fmt!r}")
+
+    runs = expand_spec(spec)
+    sink = open_sink(output, COLUMNS, fmt)
+    failed = 0
+    try:
+        with ProcessPoolExecutor(max_workers=n_workers) as pool:
+            futures = [pool.submit(run_one, params) for params in runs]
+            for done, future in enumerate(as_completed(futures), 1):
+                row = future.result()
+                failed += row.get("error") is not None
+                sink.write(row)
+                if fmt == "csv":
+                    sink.flush()  # hasil parsial tetap ada jika sweep terhenti
+                if progress is not None:
+                    progress(done, len(runs))
+    finally:
+        sink.close()
+    return failed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Sweep parameter WSN + HEED + ACO tanpa GUI")
+    parser.add_argument("spec", help="file spec sweep (JSON)")
+    parser.add_argument("-o", "--output", default="hasil_sweep.csv", help="file hasil (.csv/.parquet/.xlsx)")
+    parser.add_argument("-j", "--workers", type=int, default=None, help="jumlah proses (default: jumlah CPU)")
+    parser.add_argument("--format", choices=FORMATS, default=None)
+    args = parser.parse_args(argv)
+
+    with open(args.spec) as f:
+        spec = json.load(f)
+
+    def report(done, total):
+        print(f"\r{done}/{total} run selesai", end="", file=sys.stderr, flush=True)
+
+    failed = run_sweep(spec, args.output, n_workers=args.workers or os.cpu_count(),
+                       fmt=args.format, progress=report)
+    print(file=sys.stderr)
+    if failed:
+        print(f"{failed} run gagal, lihat kolom 'error' di {args.output}", file=sys.stderr)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
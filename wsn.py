@@ -1,46 +1,193 @@
+import hashlib
+
 import numpy as np
-import matplotlib.pyplot as plt
-import networkx as nx
+
+import instrument
+from graph import CSRGraph, radius_neighbors
+
+# batas agar plot tetap cepat untuk N besar
+MAX_LEGEND = 20
+MAX_POINTS = 20000
+CLUSTER_CMAP = "tab20"
+CLUSTER_COLORS = 20
+
+
+def decimate(n, max_points):
+    """Indeks titik yang digambar: semua jika n <= max_points, selain itu berjarak rata."""
+    if max_points is None or n <= max_points:
+        return slice(None)
+    return np.linspace(0, n - 1, max_points).astype(np.intp)
+
+
+def cluster_colors(clusters):
+    """
+    Indeks warna per node untuk colormap CLUSTER_CMAP.
+    :return: (id cluster unik, indeks warna tiap node)
+    """
+    ids, inverse = np.unique(clusters, return_inverse=True)
+    return ids, inverse % CLUSTER_COLORS
+
+
+def cluster_legend(ax, ids, max_legend=MAX_LEGEND):
+    """Legend satu entri per cluster, hanya jika jumlah cluster <= max_legend."""
+    if ax.get_legend() is not None:
+        ax.get_legend().remove()
+    if len(ids) > max_legend:
+        return None
+    import matplotlib
+    from matplotlib.lines import Line2D
+
+    cmap = matplotlib.colormaps[CLUSTER_CMAP]
+    handles = [Line2D([], [], ls="", marker="o", color=cmap(k % CLUSTER_COLORS))
+               for k in range(len(ids))]
+    return ax.legend(handles, [f"Cluster {c}" for c in ids], fontsize=7)
+
 
 class WSN:
-    def __init__(self, num_nodes, area_size=100, init_energy=1.0):
+    def __init__(self, num_nodes, area_size=100, init_energy=1.0, seed=None, pos=None):
+        """
+        :param num_nodes: jumlah node
+        :param area_size: panjang sisi area persegi
+        :param init_energy: energi awal tiap node
+        :param seed: seed posisi node; None = RNG global np.random
+        :param pos: koordinat node (num_nodes, 2) yang sudah ada (deployment
+            impor); jika diberikan, seed diabaikan
+        """
         self.num_nodes = num_nodes
         self.area_size = area_size
         self.init_energy = init_energy
-        self.pos = np.random.rand(num_nodes, 2) * area_size
+        if pos is not None:
+            pos = np.asarray(pos, dtype=float)  # memmap tetap zero-copy
+            if pos.shape != (num_nodes, 2):
+                raise ValueError(f"bentuk pos {pos.shape} tidak cocok, seharusnya {(num_nodes, 2)}")
+            self.pos = pos
+        elif seed is not None:
+            self.pos = np.random.default_rng(seed).random((num_nodes, 2)) * area_size
+        else:
+            self.pos = np.random.rand(num_nodes, 2) * area_size
         self.clusters = np.zeros(num_nodes, dtype=int)
         self.energy = np.ones(num_nodes) * init_energy  # energi per node
 
-    def plot_clusters(self, title="Clustering HEED", ax=None):
+    @classmethod
+    def from_file(cls, path, area_size=None, init_energy=1.0):
+        """
+        Muat deployment dari file .npy atau teks/CSV (kolom x, y).
+        :param area_size: None = dibulatkan ke atas dari koordinat terbesar
+        """
+        if str(path).endswith(".npy"):
+            pos = np.load(path)
+        else:
+            pos = np.loadtxt(path, delimiter=",", ndmin=2)
+        if area_size is None:
+            area_size = float(np.ceil(pos.max())) if len(pos) else 0
+        return cls(len(pos), area_size=area_size, init_energy=init_energy, pos=pos)
+
+    def save_positions(self, path):
+        """Simpan posisi node (.npy atau CSV) agar deployment bisa dipakai ulang."""
+        if str(path).endswith(".npy"):
+            np.save(path, self.pos)
+        else:
+            np.savetxt(path, self.pos, delimiter=",")
+
+    def key(self):
+        """Hash deployment (posisi node + ukuran area), kunci cache topologi."""
+        h = hashlib.sha1(np.ascontiguousarray(self.pos, dtype=float).tobytes())
+        h.update(repr(float(self.area_size)).encode())
+        return h.hexdigest()
+
+    def plot_clusters(self, title="Clustering HEED", ax=None, max_legend=MAX_LEGEND,
+                      max_points=MAX_POINTS):
+        """
+        Gambar cluster sebagai satu scatter berwarna (colormap tab20).
+        :param max_legend: legend hanya dibuat jika jumlah cluster <= nilai ini
+        :param max_points: batas titik yang digambar (N lebih besar didesimasi)
+        :return: artist scatter
+        """
         if ax is None:
+            import matplotlib.pyplot as plt  # impor saat dibutuhkan (headless aman)
             fig, ax = plt.subplots()
 
-        # warna berbeda per cluster
-        unique_clusters = np.unique(self.clusters)
-        for cluster_id in unique_clusters:
-            nodes = np.where(self.clusters == cluster_id)[0]
-            ax.scatter(self.pos[nodes, 0], self.pos[nodes, 1], label=f"Cluster {cluster_id}")
+        ids, color = cluster_colors(self.clusters)
+        idx = decimate(self.num_nodes, max_points)
+        scatter = ax.scatter(self.pos[idx, 0], self.pos[idx, 1], c=color[idx],
+                             cmap=CLUSTER_CMAP, vmin=0, vmax=CLUSTER_COLORS - 1, s=20)
+        cluster_legend(ax, ids, max_legend)
 
         ax.set_title(title)
         ax.set_xlabel("X")
         ax.set_ylabel("Y")
-        ax.legend()
+        return scatter
 
     def plot_routing(self, path, title="Routing ACO", ax=None):
         if ax is None:
+            import matplotlib.pyplot as plt
             fig, ax = plt.subplots()
         xs, ys = self.pos[path, 0], self.pos[path, 1]
-        ax.plot(xs, ys, "r-o")
+        line, = ax.plot(xs, ys, "r-o")
         ax.set_title(title)
         ax.set_xlabel("X")
         ax.set_ylabel("Y")
+        return line
+
+    def tree_segments(self, tree):
+        """Segmen garis (k, 2, 2) untuk tiap edge node -> next hop pada tree."""
+        if not tree:
+            return np.empty((0, 2, 2))
+        u = np.fromiter(tree.keys(), dtype=np.intp, count=len(tree))
+        v = np.fromiter(tree.values(), dtype=np.intp, count=len(tree))
+        return np.stack([self.pos[u], self.pos[v]], axis=1)
+
+    def plot_routing_tree(self, tree, sink, title="Routing ACO", ax=None):
+        """
+        Gambar routing tree CH -> sink sebagai satu LineCollection.
+        :param tree: dict {node: next hop} (hasil AntColony.run_multi)
+        :param sink: node tujuan
+        :return: artist LineCollection
+        """
+        from matplotlib.collections import LineCollection
+
+        if ax is None:
+            import matplotlib.pyplot as plt
+            fig, ax = plt.subplots()
+        lines = LineCollection(self.tree_segments(tree), colors="r", linewidths=1)
+        ax.add_collection(lines)
+        ax.plot(self.pos[sink, 0], self.pos[sink, 1], "ks", ms=7)
+        ax.autoscale_view()
+        ax.set_title(title)
+        ax.set_xlabel("X")
+        ax.set_ylabel("Y")
+        return lines
+
+    def build_graph(self, radius=None, fmt="networkx"):
+        """
+        Bangun graph komunikasi antar node
+        :param radius: jangkauan transmisi; None = graph lengkap (semua pasangan)
+        :param fmt: "networkx" atau "csr" (CSRGraph, untuk jaringan besar)
+        """
+        if fmt not in ("networkx", "csr"):
+            raise ValueError(f"format graph tidak dikenal: {fmt!r}")
+
+        with instrument.stage("build_graph"):
+            return self._build_graph(radius, fmt)
+
+    def _build_graph(self, radius, fmt):
+        if radius is not None:
+            csr = radius_neighbors(self.pos, radius)
+            return csr if fmt == "csr" else csr.to_networkx()
+
+        i, j = np.triu_indices(self.num_nodes, k=1)
+        dist = np.linalg.norm(self.pos[i] - self.pos[j], axis=1)
+        if fmt == "csr":
+            src = np.concatenate([i, j])
+            dst = np.concatenate([j, i])
+            order = np.lexsort((dst, src))
+            indptr = np.arange(self.num_nodes + 1) * (self.num_nodes - 1)
+            return CSRGraph(indptr, dst[order], np.concatenate([dist, dist])[order])
+
+        import networkx as nx  # impor saat dibutuhkan (graph CSR tidak memerlukannya)
 
-    def build_graph(self):
         G = nx.Graph()
-        for i in range(self.num_nodes):
-            for j in range(i+1, self.num_nodes):
-                dist = np.linalg.norm(self.pos[i] - self.pos[j])
-                G.add_edge(i, j, weight=dist)
+        G.add_weighted_edges_from(zip(i.tolist(), j.tolist(), dist.tolist()))
         return G
 
     def simulate_transmission(self, path):
@@ -55,4 +202,4 @@ class WSN:
             avg_energy = np.mean(self.energy)
             energies.append(avg_energy)
 
-        return energies
\ No newline at end of file
+        return energies
\ No newline at end of file